@@ -1,30 +1,129 @@
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Final
 
 import discord
 from discord import app_commands
 from discord.app_commands import AppCommandGroup, Command, ContextMenu, Group
 from discord.ext import commands
 
+from modules.dtypes import GuildId
 from modules.help_command import FeijoaCommand
 
 if TYPE_CHECKING:
+    from discord.app_commands import AppCommand
+
     from modules.BotCore import BotCore
 
 log = logging.getLogger(__name__)
 
+# Minimum time between two rebuilds of the command list
+REFRESH_COOLDOWN_SECONDS: Final[int] = 60
+
 
 class Help(commands.Cog):
     command_list: dict[str, FeijoaCommand]
+    # (lowercased name, command) pairs so autocomplete doesn't lowercase every name per keystroke
+    _names_lower: list[tuple[str, FeijoaCommand]]
 
     def __init__(self, bot: BotCore) -> None:
         self.bot = bot
         self.command_list = {}
-
-    async def refresh_command_list(self) -> None:  # noqa: PLR0912 - Command fetching requires multiple type checks and error handling
-        log.info("Command list is being refreshed...")
-
-        local_command_list = self.bot.tree.get_commands()
+        self._names_lower = []
+        self._dirty = False
+        self._last_refresh = 0.0
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._global_commands: dict[str, AppCommand] = {}
+        # Kept per guild so joining or leaving one only fetches or drops that guild's commands
+        self._guild_commands: dict[GuildId, dict[str, AppCommand]] = {}
+        # Joined guilds whose commands are fetched on the next rebuild
+        self._unfetched_guilds: set[GuildId] = set()
+        # Signature of the local tree the current command list was built from, None when it must be rebuilt
+        self._tree_signature: int | None = None
+
+    async def cog_unload(self) -> None:
+        """Cancel a pending command list rebuild."""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+
+    def _mark_dirty(self) -> None:
+        """Flag the command list as stale and rebuild it in the background once the cooldown allows."""
+        self._dirty = True
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_when_due())
+
+    async def _refresh_when_due(self) -> None:
+        while self._dirty:
+            delay = self._last_refresh + REFRESH_COOLDOWN_SECONDS - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                await self.refresh_command_list()
+            except discord.HTTPException:
+                log.exception("Failed to refresh the help command list")
+                # Retry once the cooldown has passed again
+                self._dirty = True
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        """Guild command registrations differ per guild, so fetch the new guild's and rebuild the list."""
+        self._unfetched_guilds.add(GuildId(guild.id))
+        self._tree_signature = None
+        self._mark_dirty()
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        """Guild command registrations differ per guild, so drop the old guild's and rebuild the list."""
+        self._guild_commands.pop(GuildId(guild.id), None)
+        self._unfetched_guilds.discard(GuildId(guild.id))
+        self._tree_signature = None
+        self._mark_dirty()
+
+    @commands.hybrid_command(
+        name="refreshhelp",
+        description="Rebuild the /help command list from freshly fetched commands (bot owner only).",
+    )
+    @commands.is_owner()
+    @app_commands.default_permissions(administrator=True)
+    async def refresh_help(self, ctx: commands.Context) -> None:
+        """Rebuild the /help command list from freshly fetched commands, at most once per cooldown."""
+        self._invalidate_server_commands()
+        self._mark_dirty()
+        await ctx.send("Help command list will be refreshed.", ephemeral=True)
+
+    def cache_server_commands(self, server_commands: list[AppCommand]) -> None:
+        """Seed the global command cache, e.g. with the result of a global sync."""
+        self._global_commands = {cmd.name: cmd for cmd in server_commands}
+        self._tree_signature = None
+
+    def _invalidate_server_commands(self) -> None:
+        self._global_commands = {}
+        self._guild_commands = {}
+        self._unfetched_guilds.clear()
+        self._tree_signature = None
+
+    def _server_commands(self) -> dict[str, AppCommand]:
+        """Merge the cached global commands with every guild's, guild commands taking precedence."""
+        server_by_name = dict(self._global_commands)
+        for guild_commands in self._guild_commands.values():
+            server_by_name.update(guild_commands)
+        return server_by_name
+
+    def _local_tree_signature(self) -> int:
+        return hash(
+            tuple(
+                (
+                    cmd.qualified_name,
+                    cmd.description,
+                    tuple(param.name for param in cmd.parameters) if isinstance(cmd, Command) else (),
+                )
+                for cmd in self.bot.tree.walk_commands()
+            ),
+        )
+
+    async def _fetch_server_commands(self) -> None:
         server_command_list = []
 
         try:
@@ -32,54 +131,83 @@ class Help(commands.Cog):
         except discord.HTTPException:
             log.exception("Failed to fetch global commands")
 
-        server_by_name = {cmd.name: cmd for cmd in server_command_list}
+        self._global_commands = {cmd.name: cmd for cmd in server_command_list}
+        self._guild_commands = {}
+        self._unfetched_guilds.clear()
+
+        for guild in self.bot.guilds:
+            await self._fetch_guild_commands(guild)
+
+    async def _fetch_guild_commands(self, guild: discord.Guild) -> None:
+        try:
+            guild_commands = await self.bot.tree.fetch_commands(guild=guild)
+        except discord.HTTPException, discord.Forbidden:
+            log.warning("Failed to fetch commands for guild %s (%s)", guild.id, guild.name)
+            return
+        self._guild_commands[GuildId(guild.id)] = {cmd.name: cmd for cmd in guild_commands}
+
+    async def refresh_command_list(self) -> None:  # noqa: PLR0912 - Command fetching requires multiple type checks and error handling
+        log.info("Command list is being refreshed...")
+        # Cleared before any await so changes made during the rebuild mark it dirty again
+        self._dirty = False
+        self._last_refresh = time.monotonic()
+
+        tree_signature = self._local_tree_signature()
+        if tree_signature == self._tree_signature:
+            log.info("Command tree is unchanged, keeping the current command list.")
+            return
 
-        if self.bot.guilds:
-            for guild in self.bot.guilds:
-                try:
-                    guild_commands = await self.bot.tree.fetch_commands(guild=guild)
-                    for cmd in guild_commands:
-                        server_by_name[cmd.name] = cmd
-                except discord.HTTPException, discord.Forbidden:
-                    log.warning("Failed to fetch commands for guild %s (%s)", guild.id, guild.name)
+        local_command_list = self.bot.tree.get_commands()
+        root_names = [local.name for local in local_command_list if not isinstance(local, ContextMenu)]
+        # Only the command IDs come from Discord, so cached server commands are reused while they cover the local tree
+        cached = self._server_commands()
+        if not all(name in cached for name in root_names):
+            await self._fetch_server_commands()
+        else:
+            for guild_id in list(self._unfetched_guilds):
+                self._unfetched_guilds.discard(guild_id)
+                if guild := self.bot.get_guild(guild_id):
+                    await self._fetch_guild_commands(guild)
+        server_by_name = self._server_commands()
 
         new_command_list: dict[str, FeijoaCommand] = {}
+        local_subcommands: list[Command] = []
 
         for local in local_command_list:
-            if isinstance(local, ContextMenu | Group):
+            if isinstance(local, ContextMenu):
+                continue
+
+            if isinstance(local, Group):
+                local_subcommands.extend(cmd for cmd in local.commands if isinstance(cmd, Command))
                 continue
 
             server = server_by_name.get(local.name)
             if server:
                 new_command_list[local.name] = FeijoaCommand.from_app_command((local, server))
 
-        local_subcommands: list[Command] = []
-        for group in local_command_list:
-            if isinstance(group, Group):
-                local_subcommands.extend(cmd for cmd in group.commands if isinstance(cmd, Command))
-
-        server_subcommands: list[AppCommandGroup] = []
+        server_subcommand_by_name: dict[str, AppCommandGroup] = {}
         for cmd in server_by_name.values():
-            if cmd.options:
-                server_subcommands.extend(option for option in cmd.options if isinstance(option, AppCommandGroup))
-
-        server_subcommand_by_name = {cmd.name: cmd for cmd in server_subcommands}
+            for option in cmd.options:
+                if isinstance(option, AppCommandGroup):
+                    server_subcommand_by_name[option.name] = option
 
         for local in local_subcommands:
-            if isinstance(local, ContextMenu):
-                continue
-
             server = server_subcommand_by_name.get(local.name)
             if server:
                 new_command_list[server.qualified_name] = FeijoaCommand.from_app_subcommand((local, server))
 
         self.command_list = new_command_list
+        self._names_lower = [(name.lower(), cmd) for name, cmd in new_command_list.items()]
+        # A list missing commands (e.g. after a failed fetch) is rebuilt on the next refresh
+        if all(name in server_by_name for name in root_names):
+            self._tree_signature = tree_signature
 
     async def command_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        current_lower = current.lower()
         return [
-            app_commands.Choice(name=name, value=name)
-            for name, cmd in self.command_list.items()
-            if name.lower().startswith(current.lower()) and cmd.can_be_executed_by(interaction.permissions)
+            app_commands.Choice(name=cmd.name, value=cmd.name)
+            for name_lower, cmd in self._names_lower
+            if name_lower.startswith(current_lower) and cmd.can_be_executed_by(interaction.permissions)
         ][:25]
 
     @app_commands.command(
@@ -95,15 +223,14 @@ class Help(commands.Cog):
 
         if not command:  # Show generic command list
             embed.colour = discord.Color.green()
-            command_list_str = ""
-            for command_name, cmd in self.command_list.items():
-                if not cmd.can_be_executed_by(interaction.permissions):
-                    continue
-
-                command_list_str += f"- /{command_name}\n"
+            command_lines = [
+                f"- /{command_name}"
+                for command_name, cmd in self.command_list.items()
+                if cmd.can_be_executed_by(interaction.permissions)
+            ]
 
             embed.title = "Command List"
-            embed.description = command_list_str
+            embed.description = "\n".join(command_lines)
 
         elif command in self.command_list and self.command_list[command].can_be_executed_by(interaction.permissions):
             requested_cmd = self.command_list[command]
@@ -119,39 +246,15 @@ class Help(commands.Cog):
                         f"Description: `{requested_cmd.description}`",
                         f"Is Staff-Only: `{requested_cmd.is_staff()}`",
                         f"[Required Permissions](<https://discord.com/developers/docs/topics/permissions>): "
-                        f"`{requested_cmd.permissions}`",
+                        f"`{requested_cmd.get_pretty_printed_perms() or 'None'}`",
                     ],
                 ),
             )
 
-            args_usage: list[str] = []
             if requested_cmd.has_args():
-                args_str = ""
-                for index, argument in enumerate(requested_cmd.args.values()):
-                    args_str += "\n".join(
-                        [
-                            f"Name: `{argument.name}`",
-                            f"Description: `{argument.description}`",
-                            f"Type: `{argument.type.name}`",
-                            f"Required: `{argument.required}`",
-                        ],
-                    )
-
-                    if argument.required:
-                        args_usage.append(f"<{argument.name}: {argument.type.name}>")
-                    else:
-                        args_usage.append(f"({argument.name}: {argument.type.name})")
-
-                    if index != len(requested_cmd.args) - 1:
-                        args_str += "\n----------\n"
-
-                embed.add_field(name="Arguments", inline=False, value=args_str)
+                embed.add_field(name="Arguments", inline=False, value=requested_cmd.rendered_args)
 
-            embed.add_field(
-                name="Usage",
-                inline=False,
-                value=f"<> = required; () = optional\n```/{requested_cmd.name} {' '.join(args_usage)}```",
-            )
+            embed.add_field(name="Usage", inline=False, value=requested_cmd.rendered_usage)
 
         else:  # Invalid command
             embed.title = "Error"
@@ -1,5 +1,7 @@
+import asyncio
 import logging
-from datetime import datetime
+import time
+from collections import Counter
 from typing import TYPE_CHECKING, Final
 
 import discord
@@ -8,6 +10,8 @@ from discord.ext import commands
 
 from modules.dtypes import GuildId, InviterId, UserId
 from modules.guild_cog import GuildOnlyHybridCog
+from modules.invite_cache import GuildInviteCache
+from modules.InvitesDB import to_joined_at_batch
 
 if TYPE_CHECKING:
     from modules.BotCore import BotCore
@@ -16,6 +20,8 @@ if TYPE_CHECKING:
 log = logging.getLogger(__name__)
 
 SECOND_COOLDOWN: Final[int] = 1
+# Guilds whose invites are fetched at the same time while recaching
+INVITE_FETCH_CONCURRENCY: Final[int] = 10
 
 
 class InvitesCog(GuildOnlyHybridCog):
@@ -27,47 +33,70 @@ class InvitesCog(GuildOnlyHybridCog):
     def __init__(self, bot: BotCore, invites_db: InvitesDB) -> None:  # Removed guild_id, alert_channel_id from init
         self.bot = bot
         self.invites_db = invites_db
-        self.invites: dict[GuildId, dict[str, int]] = {}  # Cache still needed for invite diffing
+        self.invites: dict[GuildId, GuildInviteCache] = {}  # Cache still needed for invite diffing
+        # Joins are diffed one at a time per guild; a burst shares one fetched snapshot.
+        self._invite_locks: dict[GuildId, asyncio.Lock] = {}
+        self._invite_snapshots: dict[GuildId, tuple[float, list[discord.Invite]]] = {}
+        self._pending_joins: Counter[GuildId] = Counter()
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         """Cache invites for all guilds on startup."""
         await self.recache_all_invites()
 
+    def _guild_lock(self, guild_id: GuildId) -> asyncio.Lock:
+        """Return the lock that serializes invite cache updates for a guild."""
+        return self._invite_locks.setdefault(guild_id, asyncio.Lock())
+
     async def recache_all_invites(self) -> None:
-        """Clear and re-populate the invite cache for all guilds."""
-        self.invites.clear()
+        """Re-populate the invite cache for all guilds."""
         await self.bot.wait_until_ready()
-        for guild in self.bot.guilds:
-            try:
+        for stale_guild_id in self.invites.keys() - {GuildId(guild.id) for guild in self.bot.guilds}:
+            del self.invites[stale_guild_id]
+
+        semaphore = asyncio.Semaphore(INVITE_FETCH_CONCURRENCY)
+        await asyncio.gather(*(self._recache_guild_invites(guild, semaphore) for guild in self.bot.guilds))
+
+    async def _recache_guild_invites(self, guild: discord.Guild, semaphore: asyncio.Semaphore) -> None:
+        """Re-populate the invite cache for one guild."""
+        guild_id = GuildId(guild.id)
+        try:
+            async with semaphore, self._guild_lock(guild_id):
+                if self._pending_joins[guild_id]:
+                    # Queued joins still have uses to claim; the last one reconciles the cache.
+                    return
                 # Store invites with the code as the key and the uses as the value.
-                self.invites[GuildId(guild.id)] = {invite.code: invite.uses for invite in await guild.invites()}
-                log.info(
-                    "Successfully cached %s invites for guild %s.",
-                    len(self.invites[GuildId(guild.id)]),
-                    guild.name,
-                )
-            except discord.Forbidden:
-                log.warning(
-                    "Bot lacks 'Manage Server' permissions to fetch invites for guild %s.",
-                    guild.name,
-                )
-                self.bot.dispatch(
-                    "security_alert",
-                    guild_id=guild.id,
-                    risk_level="HIGH",
-                    details=(
-                        "**Invite Tracking Failed**\n"
-                        "I cannot track invites because I am missing the `Manage Server` permission.\n"
-                        "Invite tracking will be disabled until this is fixed."
-                    ),
-                    warning_type="invite_tracking_fail",
-                )
-            except discord.HTTPException:
-                log.exception(
-                    "An HTTP error occurred while fetching invites for guild %s.",
-                    guild.name,
+                guild_invites = GuildInviteCache.from_pairs(
+                    (invite.code, invite.uses) for invite in await guild.invites() if invite.uses is not None
                 )
+                self.invites[guild_id] = guild_invites
+            log.info(
+                "Successfully cached %s invites for guild %s.",
+                len(guild_invites),
+                guild.name,
+            )
+        except discord.Forbidden:
+            self.invites.pop(guild_id, None)
+            log.warning(
+                "Bot lacks 'Manage Server' permissions to fetch invites for guild %s.",
+                guild.name,
+            )
+            self.bot.dispatch(
+                "security_alert",
+                guild_id=guild.id,
+                risk_level="HIGH",
+                details=(
+                    "**Invite Tracking Failed**\n"
+                    "I cannot track invites because I am missing the `Manage Server` permission.\n"
+                    "Invite tracking will be disabled until this is fixed."
+                ),
+                warning_type="invite_tracking_fail",
+            )
+        except discord.HTTPException:
+            log.exception(
+                "An HTTP error occurred while fetching invites for guild %s.",
+                guild.name,
+            )
 
     @commands.Cog.listener()
     async def on_resumed(self) -> None:
@@ -81,29 +110,16 @@ class InvitesCog(GuildOnlyHybridCog):
         if member.bot:
             return
 
+        received_at = time.monotonic()
         inviter_id: InviterId = None
-        invite_code: str | None = None
+        used_invite: discord.Invite | None = None
 
         try:
             inviter = None
             try:
-                guild_invites = self.invites.get(member.guild.id, {})
-                current_invites = await member.guild.invites()
-
-                # Compare current invites with the cached invites to find the one that was used
-                for invite in current_invites:
-                    if invite.uses is not None and (
-                        invite.code not in guild_invites or invite.uses > guild_invites.get(invite.code, 0)
-                    ):
-                        inviter = invite.inviter
-                        invite_code = invite.code
-                        break  # Found the invite, stop searching.
-
-                # Update the cache with the new uses
-                self.invites[GuildId(member.guild.id)] = {
-                    invite.code: invite.uses for invite in current_invites if invite.uses is not None
-                }
-
+                used_invite = await self._find_used_invite(member.guild, received_at)
+                if used_invite:
+                    inviter = used_invite.inviter
             except discord.Forbidden:
                 log.warning("Missing 'Manage Server' permissions for guild %d.", member.guild.id)
                 self.bot.dispatch(
@@ -146,23 +162,73 @@ class InvitesCog(GuildOnlyHybridCog):
             # Ensure we don't crash before dispatching
 
         # Must ALWAYS happen, guaranteeing the join log appears
-        self.bot.dispatch("invite_recorded", member, inviter_id, invite_code)
+        self.bot.dispatch("invite_recorded", member, inviter_id, used_invite)
+
+    async def _find_used_invite(self, guild: discord.Guild, received_at: float) -> discord.Invite | None:
+        """Find the invite whose uses grew for a join received at ``received_at``.
+
+        A snapshot fetched after the join was received already counts its use, so
+        joins queued behind the guild lock reuse it instead of calling the API again.
+        The cache tracks uses that have been attributed to a joiner, and is only
+        reconciled with the snapshot once no other joins are waiting on it.
+        """
+        guild_id = GuildId(guild.id)
+        self._pending_joins[guild_id] += 1
+        try:
+            async with self._guild_lock(guild_id):
+                snapshot = self._invite_snapshots.get(guild_id)
+                if snapshot is None or snapshot[0] < received_at:
+                    fetched_at = time.monotonic()
+                    snapshot = (fetched_at, await guild.invites())
+                    self._invite_snapshots[guild_id] = snapshot
+
+                current_invites = snapshot[1]
+                guild_invites = self.invites.setdefault(guild_id, GuildInviteCache())
+
+                # Claim one use of the first invite that has more uses than we have attributed
+                used_invite = None
+                for invite in current_invites:
+                    if invite.uses is not None and invite.uses > guild_invites.get(invite.code):
+                        guild_invites.set(invite.code, guild_invites.get(invite.code) + 1)
+                        used_invite = invite
+                        break
+
+                if self._pending_joins[guild_id] == 1:
+                    # Every join counted by the snapshot has claimed its invite
+                    guild_invites.sync((invite.code, invite.uses) for invite in current_invites if invite.uses is not None)
+                    self._invite_snapshots.pop(guild_id, None)
+
+                return used_invite
+        finally:
+            self._pending_joins[guild_id] -= 1
+            if not self._pending_joins[guild_id]:
+                del self._pending_joins[guild_id]
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        """Drop all invite tracking state for a guild the bot has left."""
+        guild_id = GuildId(guild.id)
+        self.invites.pop(guild_id, None)
+        self._invite_snapshots.pop(guild_id, None)
+        if not self._pending_joins[guild_id]:
+            self._invite_locks.pop(guild_id, None)
 
     @commands.Cog.listener()
     async def on_invite_create(self, invite: discord.Invite) -> None:
         """Handle new invite creation to keep the cache updated."""
         if invite.guild and invite.uses is not None:  # Ensure guild exists and uses is not None
-            guild_id = GuildId(invite.guild.id)
-            if guild_id not in self.invites:
-                self.invites[guild_id] = {}
-            self.invites[guild_id][invite.code] = invite.uses
+            self.invites.setdefault(GuildId(invite.guild.id), GuildInviteCache()).set(invite.code, invite.uses)
             log.info("Cached new invite '%s' for guild '%s'.", invite.code, invite.guild.name)
 
     @commands.Cog.listener()
     async def on_invite_delete(self, invite: discord.Invite) -> None:
         """Handle invite deletion to keep the cache updated."""
-        if invite.guild and GuildId(invite.guild.id) in self.invites and invite.code in self.invites[GuildId(invite.guild.id)]:
-            del self.invites[GuildId(invite.guild.id)][invite.code]
+        if not invite.guild:
+            return
+
+        guild_invites = self.invites.get(GuildId(invite.guild.id))
+        if guild_invites is not None and invite.code in guild_invites:
+            guild_invites.discard(invite.code)
             log.info(
                 "Removed deleted invite '%s' from cache for guild '%s'.",
                 invite.code,
@@ -174,7 +240,7 @@ class InvitesCog(GuildOnlyHybridCog):
     async def invites_top(self, interaction: discord.Interaction) -> None:
         """Display the top 10 inviters in an embed."""
         await interaction.response.defer()
-        # This new method returns a sorted list of (user_id, invite_count) tuples
+        # Sorted and limited to the top 10 by the database
         leaderboard_data = await self.invites_db.get_invite_leaderboard(GuildId(interaction.guild.id))
 
         embed = discord.Embed(title="🏆 Top Invites Leaderboard", color=discord.Color.gold())
@@ -239,7 +305,7 @@ class InvitesCog(GuildOnlyHybridCog):
             await interaction.followup.send("Could not fetch any members from the Discord API.")
             return
 
-        member_data_list = []
+        parsed_members: list[tuple[UserId, InviterId, str | None]] = []
         for member_data in all_members:
             inviter_id_str = member_data.get("inviter_id")
             # We still process members without an inviter_id to update their joined_at
@@ -252,16 +318,14 @@ class InvitesCog(GuildOnlyHybridCog):
             except KeyError, ValueError:
                 continue
 
-            joined_at_db: str | None = None
-            if joined_at_str:
-                try:
-                    dt_object = datetime.fromisoformat(joined_at_str)
-                    joined_at_db = dt_object.strftime("%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    log.warning("Could not parse joined_at timestamp: %s", joined_at_str)
-                    joined_at_db = None  # Let the DB handle it
+            parsed_members.append((invitee_id, inviter_id, joined_at_str))
 
-            member_data_list.append((invitee_id, inviter_id, guild_id, joined_at_db))
+        # Convert every timestamp in one batch rather than one datetime per member
+        joined_at_values = to_joined_at_batch([joined_at_str for _, _, joined_at_str in parsed_members])
+        member_data_list = [
+            (invitee_id, inviter_id, guild_id, joined_at_db)
+            for (invitee_id, inviter_id, _), joined_at_db in zip(parsed_members, joined_at_values, strict=True)
+        ]
 
         rows_affected = await self.invites_db.bulk_sync_invites(member_data_list)
         await interaction.followup.send(f"Sync complete. {rows_affected} records were created or updated.")
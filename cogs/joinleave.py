@@ -1,20 +1,57 @@
 import logging
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final
 
 import discord
 from discord.ext import commands
+from discord.flags import alias_flag_value
 
-from modules.dtypes import GuildId, InviterId, RoleId, UserId
+from modules.dtypes import ChannelId, GuildId, InviterId, UserId
+from modules.embed_batcher import EmbedBatcher
 from modules.security_utils import check_bot_hierarchy, check_verifiable_role
 from modules.utils import format_ordinal
 
 if TYPE_CHECKING:
     from modules.BotCore import BotCore
-    from modules.ConfigDB import ConfigDB
+    from modules.ConfigDB import ConfigDB, GuildConfig
     from modules.InvitesDB import InvitesDB
 
 log = logging.getLogger(__name__)
 
+# (bit, name) of every public user flag that counts as an account indicator, tested against the raw flag value
+_PUBLIC_FLAG_BITS: Final[tuple[tuple[int, str], ...]] = tuple(
+    (bit, name)
+    for name, bit in discord.PublicUserFlags.VALID_FLAGS.items()
+    if name != "spammer" and not isinstance(getattr(discord.PublicUserFlags, name), alias_flag_value)
+)
+
+
+@dataclass(slots=True)
+class MemberCounts:
+    """Running member tallies so the join ordinal doesn't need a scan of the member list."""
+
+    with_roles: int = 0  # Humans with a role besides @everyone
+    with_roles_onboarded: int = 0  # Of those, humans who completed onboarding
+    onboarded: int = 0  # Humans who completed onboarding
+
+    def apply(self, member: discord.Member, delta: int) -> None:
+        """Add (delta=1) or remove (delta=-1) a member from the tallies."""
+        if member.bot:
+            return
+
+        onboarded = member.flags.completed_onboarding
+        if onboarded:
+            self.onboarded += delta
+        if len(member.roles) > 1:
+            self.with_roles += delta
+            if onboarded:
+                self.with_roles_onboarded += delta
+
+    @property
+    def member_count(self) -> int:
+        # Only filter by completed_onboarding if any members have completed it
+        return self.with_roles_onboarded if self.onboarded else self.with_roles
+
 
 class JoinLeaveLogCog(commands.Cog):
     """A cog for logging member join and leave events to a specified channel."""
@@ -23,17 +60,42 @@ class JoinLeaveLogCog(commands.Cog):
         self.bot = bot
         self.config_db = config_db
         self.invites_db = invites_db
+        # Built lazily from one scan per chunked guild, then kept current by member events
+        self._member_counts: dict[GuildId, MemberCounts] = {}
+        # One sender per log channel, so log lines that arrive during a send share the next message
+        self._log_batcher = EmbedBatcher(self._send_log_embeds)
+        # Resolved log channels, evicted when the channel is changed or deleted
+        self._log_channels: dict[ChannelId, discord.TextChannel] = {}
+
+    async def cog_unload(self) -> None:
+        """Stop the log senders."""
+        self._log_batcher.close()
+
+    def _get_member_counts(self, guild: discord.Guild) -> MemberCounts:
+        counts = self._member_counts.get(GuildId(guild.id))
+        if counts is None:
+            counts = MemberCounts()
+            for m in guild.members:
+                counts.apply(m, 1)
+            # Until the guild is chunked its member cache is partial, so only keep a complete tally
+            if guild.chunked:
+                self._member_counts[GuildId(guild.id)] = counts
+        return counts
+
+    def _track_member(self, member: discord.Member, delta: int) -> None:
+        """Update the tallies of a guild that has already been counted."""
+        counts = self._member_counts.get(GuildId(member.guild.id))
+        if counts is not None:
+            counts.apply(member, delta)
 
     async def _log_event(
         self,
         member: discord.Member,
+        log_channel_id: ChannelId | None,
         title: str,
         color: discord.Colour,
         description_parts: list[str],
     ) -> None:
-        config = await self.config_db.get_guild_config(GuildId(member.guild.id))
-        log_channel_id = config.join_leave_log_channel_id
-
         if not log_channel_id:
             log.warning("Log channel not available, cannot send join/leave log.")
             return
@@ -52,8 +114,8 @@ class JoinLeaveLogCog(commands.Cog):
         embed.set_thumbnail(url=member.display_avatar)
         embed.title = title
 
-        log_channel = self.bot.get_channel(log_channel_id)
-        if not isinstance(log_channel, discord.TextChannel):
+        log_channel = self._get_log_channel(log_channel_id)
+        if log_channel is None:
             log.warning(
                 "Configured join/leave log channel %d not found or is not a text channel for guild %d.",
                 log_channel_id,
@@ -61,14 +123,26 @@ class JoinLeaveLogCog(commands.Cog):
             )
             return
 
+        self._log_batcher.queue(log_channel, embed)
+
+    def _get_log_channel(self, log_channel_id: ChannelId) -> discord.TextChannel | None:
+        log_channel = self._log_channels.get(log_channel_id)
+        if log_channel is None:
+            channel = self.bot.get_channel(log_channel_id)
+            if not isinstance(channel, discord.TextChannel):
+                return None
+            log_channel = self._log_channels[log_channel_id] = channel
+        return log_channel
+
+    async def _send_log_embeds(self, log_channel: discord.TextChannel, embeds: list[discord.Embed]) -> None:
         try:
             # Defensively disable all pings. Only display mentions.
-            await log_channel.send(embed=embed, allowed_mentions=None)
+            await log_channel.send(embeds=embeds, allowed_mentions=None)
         except discord.Forbidden:
-            log.warning("Permission denied sending join/leave log in guild %s", member.guild.id)
+            log.warning("Permission denied sending join/leave log in guild %s", log_channel.guild.id)
             self.bot.dispatch(
                 "security_alert",
-                guild_id=member.guild.id,
+                guild_id=log_channel.guild.id,
                 risk_level="HIGH",
                 details=(
                     f"**Join/Leave Log Permission Error**\n"
@@ -82,11 +156,11 @@ class JoinLeaveLogCog(commands.Cog):
 
     async def _autovalidate_member(  # noqa: PLR0912 - Security validation requires multiple indicator checks
         self,
-        verified_role_id: RoleId,
+        role: discord.Role,
         member: discord.Member,
         invite: discord.Invite | None = None,
     ) -> discord.Role | None:
-        """Automatically assign verified role id if user looks safe.
+        """Automatically assign the verified role if user looks safe.
 
         Logic:
         1. BOTS are never auto-verified.
@@ -96,9 +170,6 @@ class JoinLeaveLogCog(commands.Cog):
         """
         verified_role: discord.Role | None = None
 
-        if not verified_role_id:
-            return verified_role
-
         # Explicitly exclude bots from verification
         if member.bot:
             return None
@@ -118,7 +189,8 @@ class JoinLeaveLogCog(commands.Cog):
             user_indicators.append(f"boosting_since={member.premium_since}")
 
         # PublicUserFlags
-        public_flags = [flag_name for flag_name, has_flag in member.public_flags if has_flag and flag_name != "spammer"]
+        flag_value = member.public_flags.value
+        public_flags = [name for bit, name in _PUBLIC_FLAG_BITS if flag_value & bit]
         if public_flags:
             user_indicators.append(f"public_flags={','.join(public_flags)}")
 
@@ -142,51 +214,49 @@ class JoinLeaveLogCog(commands.Cog):
                 user_indicators.append("safe_invite=True")
 
         if user_indicators:
-            role = member.guild.get_role(verified_role_id)
-            if role:
-                # Check that the role only has permissions from the allowed list
-                verified_result = check_verifiable_role(role)
-                hierarchy_result = check_bot_hierarchy(member.guild, role)
-
-                if not verified_result.ok:
-                    self.bot.dispatch(
-                        "security_alert",
-                        guild_id=member.guild.id,
-                        risk_level="HIGH",
-                        details=(
-                            f"**Auto-Verification Blocked**\n"
-                            f"**Blocked** auto-verification for {member.mention}. "
-                            f"The configured `verified_role_id` ({role.mention}) has disallowed permissions: "
-                            f"{verified_result.reason}"
-                        ),
-                        warning_type="dangerous_role_assignment",
-                    )
-                elif not hierarchy_result.ok:
-                    self.bot.dispatch(
-                        "security_alert",
-                        guild_id=member.guild.id,
-                        risk_level="HIGH",
-                        details=(
-                            f"**Auto-Verification Failed**\n"
-                            f"**Failed** auto-verification for {member.mention}. "
-                            f"I cannot assign the `verified_role_id` ({role.mention}): {hierarchy_result.reason}"
-                        ),
-                        warning_type="role_hierarchy",
-                    )
-                else:
-                    # All checks passed, assign the role
-                    await member.add_roles(role, reason="Auto-verified on join")
-                    verified_role = role  # Save for logging
+            # Check that the role only has permissions from the allowed list
+            verified_result = check_verifiable_role(role)
+            hierarchy_result = check_bot_hierarchy(member.guild, role)
+
+            if not verified_result.ok:
+                self.bot.dispatch(
+                    "security_alert",
+                    guild_id=member.guild.id,
+                    risk_level="HIGH",
+                    details=(
+                        f"**Auto-Verification Blocked**\n"
+                        f"**Blocked** auto-verification for {member.mention}. "
+                        f"The configured `verified_role_id` ({role.mention}) has disallowed permissions: "
+                        f"{verified_result.reason}"
+                    ),
+                    warning_type="dangerous_role_assignment",
+                )
+            elif not hierarchy_result.ok:
+                self.bot.dispatch(
+                    "security_alert",
+                    guild_id=member.guild.id,
+                    risk_level="HIGH",
+                    details=(
+                        f"**Auto-Verification Failed**\n"
+                        f"**Failed** auto-verification for {member.mention}. "
+                        f"I cannot assign the `verified_role_id` ({role.mention}): {hierarchy_result.reason}"
+                    ),
+                    warning_type="role_hierarchy",
+                )
+            else:
+                # All checks passed, assign the role
+                await member.add_roles(role, reason="Auto-verified on join")
+                verified_role = role  # Save for logging
 
         return verified_role
 
     async def _handle_join_logging(
         self,
         member: discord.Member,
+        config: GuildConfig,
         inviter_id: InviterId,
         verified_role: discord.Role | None,
     ) -> None:
-        config = await self.config_db.get_guild_config(GuildId(member.guild.id))
         if not config.join_leave_log_channel_id:
             return
 
@@ -202,20 +272,12 @@ class JoinLeaveLogCog(commands.Cog):
             title += " [BOT]"
 
         # Build Description
-        # Only filter by completed_onboarding if any members have completed it
-        any_completed = any(m.flags.completed_onboarding for m in member.guild.members if not m.bot)
-        member_count = len(
-            [
-                m
-                for m in member.guild.members
-                if not m.bot and len(m.roles) > 1 and (not any_completed or m.flags.completed_onboarding)
-            ],
-        )
+        member_count = self._get_member_counts(member.guild).member_count
 
+        created_ts = int(member.created_at.timestamp())
         description = [
             f"{member.mention} was the {format_ordinal(member_count)} member to join.",
-            f"Account created: {discord.utils.format_dt(member.created_at, 'F')} \
-({discord.utils.format_dt(member.created_at, 'R')})",
+            f"Account created: <t:{created_ts}:F> (<t:{created_ts}:R>)",
         ]
 
         if inviter_id:
@@ -224,7 +286,7 @@ class JoinLeaveLogCog(commands.Cog):
         if verified_role:
             description.append(f"**Auto-verified with:** {verified_role.mention}")
 
-        await self._log_event(member, title, color, description)
+        await self._log_event(member, config.join_leave_log_channel_id, title, color, description)
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member) -> None:
@@ -233,9 +295,12 @@ class JoinLeaveLogCog(commands.Cog):
         Bots are logged immediately.
         Humans are logged via `on_invite_recorded` to ensure invite tracking is complete.
         """
+        self._track_member(member, 1)
+
         # Bots do not get auto-verified by this system, but we log them immediately.
         if member.bot:
-            await self._handle_join_logging(member, inviter_id=None, verified_role=None)
+            config = await self.config_db.get_guild_config(GuildId(member.guild.id))
+            await self._handle_join_logging(member, config, inviter_id=None, verified_role=None)
         elif "megaseller" in member.name:
             await member.ban(reason="Spam account.")
 
@@ -244,7 +309,7 @@ class JoinLeaveLogCog(commands.Cog):
         self,
         member: discord.Member,
         inviter_id: InviterId,
-        invite_code: str | None,
+        invite: discord.Invite | None,
     ) -> None:
         """Handle logging and verification for human members after invite processing is complete."""
         # Refresh member from cache to ensure roles are up-to-date
@@ -252,18 +317,6 @@ class JoinLeaveLogCog(commands.Cog):
 
         config = await self.config_db.get_guild_config(GuildId(member.guild.id))
 
-        # Attempt to find the specific invite object to perform security checks
-        invite: discord.Invite | None = None
-        if not member.bot and invite_code:
-            try:
-                # Iterate active invites to find the object (for age/metadata checks)
-                for inv in await member.guild.invites():
-                    if inv.code == invite_code:
-                        invite = inv
-                        break
-            except Exception:
-                log.exception("Failed to resolve invite object for verification checks")
-
         # Perform deferred verification for humans
         verified_role: discord.Role | None = None
         if config.verified_role_id:
@@ -272,14 +325,16 @@ class JoinLeaveLogCog(commands.Cog):
             if role and role in member.roles:
                 verified_role = role
             # If not, try to autovalidate
-            elif not member.bot:
-                verified_role = await self._autovalidate_member(config.verified_role_id, member, invite)
+            elif role and not member.bot:
+                verified_role = await self._autovalidate_member(role, member, invite)
 
-        await self._handle_join_logging(member, inviter_id, verified_role)
+        await self._handle_join_logging(member, config, inviter_id, verified_role)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member) -> None:
         """Handle logging when a member leaves the server."""
+        self._track_member(member, -1)
+
         config = await self.config_db.get_guild_config(GuildId(member.guild.id))
         if not config.join_leave_log_channel_id:
             return  # This guild hasn't configured this feature, so we do nothing.
@@ -290,17 +345,14 @@ class JoinLeaveLogCog(commands.Cog):
         if member.bot:
             title += " [BOT]"
 
-        # Format the roles the member had
-        roles = [r.mention for r in member.roles if r.id != member.guild.default_role.id]
-        roles_str = " ".join(roles) if roles else "None"
+        # Format the roles the member had; member.roles always starts with @everyone
+        roles_str = " ".join(r.mention for r in member.roles[1:]) or "None"
 
         # Prepare description lines
         description = [f"{member.mention} has left the server."]
         if member.joined_at:
-            description.append(
-                f"**Joined:** {discord.utils.format_dt(member.joined_at, 'F')} \
-({discord.utils.format_dt(member.joined_at, 'R')})",
-            )
+            joined_ts = int(member.joined_at.timestamp())
+            description.append(f"**Joined:** <t:{joined_ts}:F> (<t:{joined_ts}:R>)")
 
         description.append(f"**Roles:** {roles_str}")
 
@@ -316,7 +368,46 @@ class JoinLeaveLogCog(commands.Cog):
             except Exception:
                 log.exception("Failed to get inviter from DB for leave log")
 
-        await self._log_event(member, title, color, description)
+        await self._log_event(member, config.join_leave_log_channel_id, title, color, description)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        """Keep the member tallies current as roles and onboarding state change."""
+        self._track_member(before, -1)
+        self._track_member(after, 1)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent) -> None:
+        """Recount a guild that lost a member the cache didn't have, as their roles are unknown."""
+        # Cached members are untracked by on_member_remove instead
+        if not isinstance(payload.user, discord.Member):
+            self._member_counts.pop(GuildId(payload.guild_id), None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        """Recount the guild, as members may have lost their only role without a member update."""
+        self._member_counts.pop(GuildId(role.guild.id), None)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        """Drop the member tallies and log channels of a guild the bot has left."""
+        self._member_counts.pop(GuildId(guild.id), None)
+        for channel in guild.channels:
+            self._forget_log_channel(ChannelId(channel.id))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        """Stop logging to a deleted channel."""
+        self._forget_log_channel(ChannelId(channel.id))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, _after: discord.abc.GuildChannel) -> None:
+        """Resolve a changed channel again on its next log line."""
+        self._log_channels.pop(ChannelId(before.id), None)
+
+    def _forget_log_channel(self, channel_id: ChannelId) -> None:
+        self._log_channels.pop(channel_id, None)
+        self._log_batcher.forget(channel_id)
 
 
 async def setup(bot: BotCore) -> None:
@@ -1,14 +1,18 @@
+import asyncio
 import contextlib
 import datetime
 import logging
 import math
+import re
+import time
 from typing import TYPE_CHECKING, Final, Literal
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from modules.dtypes import GuildId, GuildInteraction
+from modules.bounded_dict import BoundedDict
+from modules.dtypes import GuildId, GuildInteraction, UserId
 from modules.guild_cog import GuildOnlyHybridCog
 from modules.security_utils import (
     SecurityCheckError,
@@ -17,19 +21,55 @@ from modules.security_utils import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
     from modules.BotCore import BotCore
     from modules.ConfigDB import ConfigDB
 
 log = logging.getLogger(__name__)
 
-# A dictionary to convert user-friendly time units to timedelta objects
-TIME_UNITS: Final[dict[str, str]] = {
-    "s": "seconds",
-    "m": "minutes",
-    "h": "hours",
-    "d": "days",
+# Durations like '10m' or '1d'; the unit is looked up in TIME_UNITS
+_DURATION_RE: Final = re.compile(r"(\d+)([a-z])")
+
+# Seconds per user-friendly time unit
+TIME_UNITS: Final[dict[str, int]] = {
+    "s": 1,
+    "m": 60,
+    "h": 3600,
+    "d": 86400,
+}
+
+# Common durations offered while typing, so most timeouts are picked in a valid format
+DURATION_CHOICES: Final[tuple[app_commands.Choice[str], ...]] = (
+    app_commands.Choice(name="10 minutes", value="10m"),
+    app_commands.Choice(name="1 hour", value="1h"),
+    app_commands.Choice(name="12 hours", value="12h"),
+    app_commands.Choice(name="1 day", value="1d"),
+    app_commands.Choice(name="3 days", value="3d"),
+    app_commands.Choice(name="7 days", value="7d"),
+    app_commands.Choice(name="28 days", value="28d"),
+)
+
+# Discord's timeout limit of 28 days
+MAX_TIMEOUT_SECONDS: Final[int] = 28 * 86400
+
+# Message history deleted for each /moderate ban choice
+BAN_DELETE_SECONDS: Final[dict[str, int]] = {
+    "Don't delete any": 0,
+    "Last 24 hours": 86400,
+    "Last 7 days": 604800,
 }
 
+# Colour of the DM sent to moderated members
+NOTIFY_COLOUR: Final[int] = discord.Colour.red().value
+
+# How long a member whose DMs were closed is skipped, and how many such members are remembered
+DM_CLOSED_TTL_SECONDS: Final[float] = 3600.0
+DM_CLOSED_MAX_ENTRIES: Final[int] = 10000
+
+# Moderation actions (DM plus API call) running at once across all guilds
+MODERATION_CONCURRENCY: Final[int] = 4
+
 
 class DurationTransformer(app_commands.Transformer):
     """A transformer to convert a string like '10m' or '1d' into a timedelta."""
@@ -41,34 +81,41 @@ class DurationTransformer(app_commands.Transformer):
     ) -> datetime.timedelta:
         """Do the conversion."""
         value = value.lower().strip()
-        unit = value[-1]
 
-        if unit not in TIME_UNITS:
+        if value[-1:] not in TIME_UNITS:
             # Using AppCommandError to provide a clean error message to the user.
             msg = "Invalid duration unit. Use 's', 'm', 'h', or 'd'."
             raise app_commands.AppCommandError(msg)
 
-        try:
-            time_value = int(value[:-1])
-            delta = datetime.timedelta(**{TIME_UNITS[unit]: time_value})
+        match = _DURATION_RE.fullmatch(value)
+        if match is None:
+            msg = "Invalid duration format. Example: `10m`, `2h`, `7d`"
+            raise app_commands.AppCommandError(msg)
 
-            # Add Discord's 28-day timeout limit check directly in the transformer
-            if delta > datetime.timedelta(days=28):
-                msg = "Duration cannot exceed 28 days."
-                raise app_commands.AppCommandError(msg)
+        # Checked before building the timedelta, which would overflow on absurd values
+        seconds = int(match[1]) * TIME_UNITS[match[2]]
+        if seconds > MAX_TIMEOUT_SECONDS:
+            msg = "Duration cannot exceed 28 days."
+            raise app_commands.AppCommandError(msg)
 
-        except ValueError as e:
-            msg = "Invalid duration format. Example: `10m`, `2h`, `7d`"
-            raise app_commands.AppCommandError(msg) from e
+        return datetime.timedelta(seconds=seconds)
 
-        return delta
+    async def autocomplete(
+        self,
+        _interaction: GuildInteraction,
+        value: str,
+    ) -> list[app_commands.Choice[str]]:
+        """Suggest common durations matching what has been typed so far."""
+        value = value.lower().strip()
+        return [choice for choice in DURATION_CHOICES if choice.value.startswith(value)]
 
 
 @commands.guild_only()
 # Set default permissions for the entire command group
 @app_commands.default_permissions(moderate_members=True, manage_roles=True)
 # Add a cog-wide cooldown: 5 actions per 60 seconds, per user, per guild.
-@app_commands.checks.cooldown(5, 60.0, key=lambda i: (i.guild_id, i.user.id))
+# Guild and user IDs are packed into one int key (snowflakes fit in 64 bits) to skip a tuple per interaction.
+@app_commands.checks.cooldown(5, 60.0, key=lambda i: ((i.guild_id or 0) << 64) | i.user.id)
 class Moderate(
     GuildOnlyHybridCog,
     commands.GroupCog,
@@ -84,6 +131,9 @@ class Moderate(
     def __init__(self, bot: BotCore, *, config_db: ConfigDB) -> None:
         self.bot = bot
         self.config_db = config_db
+        self._action_semaphore = asyncio.Semaphore(MODERATION_CONCURRENCY)
+        # UserId → monotonic time a DM to them was last refused, oldest first
+        self._dm_closed: BoundedDict[UserId, float] = BoundedDict(DM_CLOSED_MAX_ENTRIES)
         super().__init__()
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
@@ -95,51 +145,24 @@ class Moderate(
             # Not a command interaction, let it pass (or fail)
             return True
 
-        # Find the subcommand's options
-        try:
-            # interaction.data['options'][0] is the subcommand (e.g., 'ban', 'kick')
-            subcommand_data = interaction.data["options"][0]
-            options = subcommand_data.get("options", [])
-        except IndexError, KeyError, AttributeError:
-            log.warning(
-                "Could not find subcommand options in interaction_check: %s",
-                interaction.data.get("name"),
-            )
-            # This is not a command this check is designed for, so let it pass.
-            return True
-
-        # Find the 'member' argument in the subcommand's options
-        member_data = next((opt for opt in options if opt["name"] == "member"), None)
-
-        if not member_data:
+        # discord.py has already parsed the subcommand's options, including the members
+        # Discord sent in the interaction's resolved data, into the namespace.
+        member = interaction.namespace.member
+        if member is None:
             # This command doesn't have a 'member' arg (e.g., a future 'purge' command).
             # We don't need to run moderation checks.
             return True
 
-        try:
-            member_id = int(member_data["value"])
-        except ValueError as e:
-            msg = "Invalid option selected."
-            raise app_commands.AppCommandError(msg) from e
-
         if not interaction.guild:
             # Should be impossible due to guild_only=True, but good practice.
             msg = "This command can only be used in a server."
             raise app_commands.CheckFailure(msg)
 
-        # Get the discord.Member object
-        member = interaction.guild.get_member(member_id)
-        if member is None:
-            try:
-                member = await interaction.guild.fetch_member(member_id)
-            except discord.NotFound:
-                # Use AppCommandError for a user-facing error that on_app_command_error won't log
-                msg = "❌ I could not find that member."
-                raise app_commands.AppCommandError(msg) from None
-            except discord.HTTPException as e:
-                log.warning("Failed to fetch member %s: %s", member_id, e)
-                msg = f"❌ Failed to fetch member: {e}"
-                raise app_commands.AppCommandError(msg) from e
+        # A plain discord.User means the user is not in this server.
+        if not isinstance(member, discord.Member):
+            # Use AppCommandError for a user-facing error that on_app_command_error won't log
+            msg = "❌ I could not find that member."
+            raise app_commands.AppCommandError(msg)
 
         # Run the centralized validation logic (raises SecurityCheckError on failure)
         try:
@@ -159,45 +182,47 @@ class Moderate(
         """Handle errors for all commands in this Cog."""
         ephemeral = True
 
+        # Commands defer before doing any work, so errors raised inside them need a followup
+        send = interaction.followup.send if interaction.response.is_done() else interaction.response.send_message
+
         # Unwrap CommandInvokeError if present
         original_error = error.original if isinstance(error, app_commands.CommandInvokeError) else error
 
         if isinstance(error, app_commands.CommandOnCooldown):
             retry_after = math.ceil(error.retry_after)
-            await interaction.response.send_message(
+            await send(
                 f"⏳ You are on cooldown. Please try again in {retry_after} second(s).",
                 ephemeral=ephemeral,
             )
         elif isinstance(error, app_commands.CheckFailure):
             # Catches hierarchy checks from interaction_check
-            await interaction.response.send_message(f"❌ {error}", ephemeral=ephemeral)
+            await send(f"❌ {error}", ephemeral=ephemeral)
         elif isinstance(original_error, SecurityCheckError):
             # Catches SecurityCheckError from commands (e.g., mute role hierarchy)
-            await interaction.response.send_message(
+            await send(
                 f"❌ **Configuration Error:**\n{original_error}",
                 ephemeral=ephemeral,
             )
         elif isinstance(error, app_commands.MissingPermissions):
-            await interaction.response.send_message(
+            await send(
                 f"❌ You do not have the required permissions: {', '.join(error.missing_permissions)}",
                 ephemeral=ephemeral,
             )
         elif isinstance(error, app_commands.BotMissingPermissions):
-            await interaction.response.send_message(
+            await send(
                 f"❌ I do not have the required permissions: {', '.join(error.missing_permissions)}",
                 ephemeral=ephemeral,
             )
         elif isinstance(error, app_commands.AppCommandError):
             # Generic AppCommandError (e.g., from transformers)
-            await interaction.response.send_message(str(error), ephemeral=ephemeral)
+            await send(str(error), ephemeral=ephemeral)
         else:
             log.exception("Unhandled error in Moderate cog: %s", error)
-            if not interaction.response.is_done():
-                with contextlib.suppress(discord.HTTPException):
-                    await interaction.response.send_message(
-                        "❌ An unexpected error occurred.",
-                        ephemeral=ephemeral,
-                    )
+            with contextlib.suppress(discord.HTTPException):
+                await send(
+                    "❌ An unexpected error occurred.",
+                    ephemeral=ephemeral,
+                )
 
     async def _notify_member(
         self,
@@ -208,18 +233,27 @@ class Moderate(
         duration: str | None = None,
     ) -> None:
         """Send a DM to the member about the moderation action."""
-        embed = discord.Embed(
-            title=f"You have been {action} in {interaction.guild.name}",
-            color=discord.Colour.red(),
-        )
-        embed.add_field(
-            name="Reason",
-            value=reason or "No reason provided.",
-            inline=False,
-        )
+        # Bots can't receive DMs, and members who refused one recently will refuse again
+        if member.bot:
+            return
+        closed_at = self._dm_closed.get(UserId(member.id))
+        if closed_at is not None:
+            if time.monotonic() - closed_at < DM_CLOSED_TTL_SECONDS:
+                return
+            del self._dm_closed[UserId(member.id)]
+
+        # Built as a plain dict; Embed.from_dict adopts the fields and footer as-is
+        fields = [{"name": "Reason", "value": reason or "No reason provided.", "inline": False}]
         if duration:
-            embed.add_field(name="Duration", value=duration, inline=False)
-        embed.set_footer(text=f"Moderator: {interaction.user.display_name}")
+            fields.append({"name": "Duration", "value": duration, "inline": False})
+        embed = discord.Embed.from_dict(
+            {
+                "title": f"You have been {action} in {interaction.guild.name}",
+                "color": NOTIFY_COLOUR,
+                "fields": fields,
+                "footer": {"text": f"Moderator: {interaction.user.display_name}"},
+            },
+        )
 
         try:
             await member.send(embed=embed)
@@ -229,6 +263,7 @@ class Moderate(
                 member.display_name,
                 member.id,
             )
+            self._dm_closed[UserId(member.id)] = time.monotonic()
         except discord.HTTPException:
             log.exception(
                 "Failed to DM %s (%s) due to an HTTP error.",
@@ -236,6 +271,48 @@ class Moderate(
                 member.id,
             )
 
+    async def _run_action(
+        self,
+        interaction: GuildInteraction,
+        action: Awaitable[object],
+        notify: Awaitable[None] | None,
+        *,
+        verb: str,
+        target: discord.abc.User,
+        success: str,
+        forbidden: str,
+        notify_first: bool = False,
+    ) -> bool:
+        """Run a moderation action while the member's DM is sent, and report the outcome.
+
+        Bounded by the cog's concurrency limit. DM failures are handled by `_notify_member`.
+        Actions that remove the member from the server must pass `notify_first`,
+        as the DM needs a shared server.
+        Returns whether the action succeeded.
+        """
+        try:
+            async with self._action_semaphore:
+                if notify is None:
+                    await action
+                elif notify_first:
+                    await notify
+                    await action
+                else:
+                    await asyncio.gather(action, notify)
+        except discord.Forbidden:
+            await interaction.followup.send(forbidden, ephemeral=True)
+            return False
+        except discord.HTTPException as e:
+            await interaction.followup.send(
+                f"A {e.status} {e.code} error has occurred.",
+                ephemeral=True,
+            )
+            log.exception("Failed to %s %s", verb, target)
+            return False
+
+        await interaction.followup.send(success, ephemeral=True)
+        return True
+
     # MODERATION COMMANDS
 
     @app_commands.command(name="ban", description="Bans a user from the server.")
@@ -254,33 +331,24 @@ class Moderate(
     ) -> None:
         """Bans a user and optionally deletes their recent messages."""
         # _pre_action_checks is handled by interaction_check
-        delete_seconds = 0
-        if delete_messages == "Last 24 hours":
-            delete_seconds = 86400
-        elif delete_messages == "Last 7 days":
-            delete_seconds = 604800
+        await interaction.response.defer(ephemeral=True)
+        delete_seconds = BAN_DELETE_SECONDS[delete_messages]
 
-        if notify_member and type(user) is discord.Member:
-            await self._notify_member(interaction, user, "banned", reason)
+        notify = (
+            self._notify_member(interaction, user, "banned", reason) if notify_member and type(user) is discord.Member else None
+        )
 
-        try:
-            await interaction.guild.ban(user, reason=reason, delete_message_seconds=delete_seconds)
-            await interaction.response.send_message(
-                f"✅ **{user.display_name}** has been banned.",
-                ephemeral=True,
-            )
+        if await self._run_action(
+            interaction,
+            interaction.guild.ban(user, reason=reason, delete_message_seconds=delete_seconds),
+            notify,
+            verb="ban",
+            target=user,
+            success=f"✅ **{user.display_name}** has been banned.",
+            forbidden="❌ I don't have the required permissions to ban this user.",
+            notify_first=True,
+        ):
             log.info("%s banned %s for: %s", interaction.user, user, reason)
-        except discord.Forbidden:
-            await interaction.response.send_message(
-                "❌ I don't have the required permissions to ban this user.",
-                ephemeral=True,
-            )
-        except discord.HTTPException as e:
-            await interaction.response.send_message(
-                f"A {e.status} {e.code} error has occurred.",
-                ephemeral=True,
-            )
-            log.exception("Failed to ban %s", user)
 
     @app_commands.command(name="kick", description="Kicks a member from the server.")
     @app_commands.checks.has_permissions(kick_members=True)  # Still need specific perm
@@ -293,27 +361,20 @@ class Moderate(
     ) -> None:
         """Kicks a member from the server."""
         # _pre_action_checks is handled by interaction_check
-        if notify_member:
-            await self._notify_member(interaction, member, "kicked", reason)
-
-        try:
-            await member.kick(reason=reason)
-            await interaction.response.send_message(
-                f"✅ **{member.display_name}** has been kicked.",
-                ephemeral=True,
-            )
+        await interaction.response.defer(ephemeral=True)
+        notify = self._notify_member(interaction, member, "kicked", reason) if notify_member else None
+
+        if await self._run_action(
+            interaction,
+            member.kick(reason=reason),
+            notify,
+            verb="kick",
+            target=member,
+            success=f"✅ **{member.display_name}** has been kicked.",
+            forbidden="❌ I don't have the required permissions to kick this member.",
+            notify_first=True,
+        ):
             log.info("%s kicked %s for: %s", interaction.user, member, reason)
-        except discord.Forbidden:
-            await interaction.response.send_message(
-                "❌ I don't have the required permissions to kick this member.",
-                ephemeral=True,
-            )
-        except discord.HTTPException as e:
-            await interaction.response.send_message(
-                f"A {e.status} {e.code} error has occurred.",
-                ephemeral=True,
-            )
-            log.exception("Failed to kick %s", member)
 
     @app_commands.command(
         name="timeout",
@@ -332,23 +393,30 @@ class Moderate(
     ) -> None:
         """Time out a member for a given duration."""
         # _pre_action_checks is handled by interaction_check
-        end_timestamp = discord.utils.utcnow() + duration
+        await interaction.response.defer(ephemeral=True)
+        ends_at = discord.utils.format_dt(discord.utils.utcnow() + duration, "F")
 
-        if notify_member:
-            await self._notify_member(
+        notify = (
+            self._notify_member(
                 interaction,
                 member,
                 "timed out",
                 reason,
-                duration=f"until {discord.utils.format_dt(end_timestamp, 'F')}",
+                duration=f"until {ends_at}",
             )
+            if notify_member
+            else None
+        )
 
-        try:
-            await member.timeout(duration, reason=reason)
-            await interaction.response.send_message(
-                f"✅ **{member.display_name}** has been timed out until {discord.utils.format_dt(end_timestamp, 'F')}.",
-                ephemeral=True,
-            )
+        if await self._run_action(
+            interaction,
+            member.timeout(duration, reason=reason),
+            notify,
+            verb="timeout",
+            target=member,
+            success=f"✅ **{member.display_name}** has been timed out until {ends_at}.",
+            forbidden="❌ I don't have the required permissions to timeout this member.",
+        ):
             log.info(
                 "%s timed out %s for %s. Reason: %s",
                 interaction.user,
@@ -356,17 +424,6 @@ class Moderate(
                 str(duration),
                 reason,
             )
-        except discord.Forbidden:
-            await interaction.response.send_message(
-                "❌ I don't have the required permissions to timeout this member.",
-                ephemeral=True,
-            )
-        except discord.HTTPException as e:
-            await interaction.response.send_message(
-                f"A {e.status} {e.code} error has occurred.",
-                ephemeral=True,
-            )
-            log.exception("Failed to timeout %s", member)
 
     @app_commands.command(name="untimeout", description="Removes a timeout from a member.")
     async def untimeout(
@@ -378,39 +435,31 @@ class Moderate(
     ) -> None:
         """Remove a timeout from a member."""
         # _pre_action_checks is handled by interaction_check
+        await interaction.response.defer(ephemeral=True)
         if not member.is_timed_out():
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "This member is not currently timed out.",
                 ephemeral=True,
             )
             return
 
-        if notify_member:
-            await self._notify_member(interaction, member, "timeout removed", reason)
-
-        try:
-            await member.timeout(None, reason=reason)
-            await interaction.response.send_message(
-                f"✅ The timeout for **{member.display_name}** has been removed.",
-                ephemeral=True,
-            )
+        notify = self._notify_member(interaction, member, "timeout removed", reason) if notify_member else None
+
+        if await self._run_action(
+            interaction,
+            member.timeout(None, reason=reason),
+            notify,
+            verb="untimeout",
+            target=member,
+            success=f"✅ The timeout for **{member.display_name}** has been removed.",
+            forbidden="❌ I don't have the required permissions to remove this timeout.",
+        ):
             log.info(
                 "%s removed timeout from %s. Reason: %s",
                 interaction.user,
                 member,
                 reason,
             )
-        except discord.Forbidden:
-            await interaction.response.send_message(
-                "❌ I don't have the required permissions to remove this timeout.",
-                ephemeral=True,
-            )
-        except discord.HTTPException as e:
-            await interaction.response.send_message(
-                f"A {e.status} {e.code} error has occurred.",
-                ephemeral=True,
-            )
-            log.exception("Failed to untimeout %s", member)
 
     @app_commands.command(
         name="mute",
@@ -425,12 +474,13 @@ class Moderate(
     ) -> None:
         """Mutes a member by adding a 'Muted' role."""
         # _pre_action_checks is handled by interaction_check
+        await interaction.response.defer(ephemeral=True)
         config = await self.config_db.get_guild_config(
             GuildId(interaction.guild.id),
         )
         muted_role_id = config.muted_role_id
         if not muted_role_id:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "The Muted Role has not been configured for this server. Use `/config set role`.",
                 ephemeral=True,
             )
@@ -438,7 +488,7 @@ class Moderate(
 
         muted_role = interaction.guild.get_role(muted_role_id)
         if not muted_role:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "The configured muted role could not be found on this server. It may have been deleted.",
                 ephemeral=True,
             )
@@ -459,34 +509,25 @@ class Moderate(
         # It will be caught by on_app_command_error if it fails.
         ensure_bot_hierarchy(interaction, muted_role)
 
-        if muted_role in member.roles:
-            await interaction.response.send_message(
+        if member.get_role(muted_role.id):
+            await interaction.followup.send(
                 "This member is already muted.",
                 ephemeral=True,
             )
             return
 
-        if notify_member:
-            await self._notify_member(interaction, member, "muted", reason)
-
-        try:
-            await member.add_roles(muted_role, reason=reason)
-            await interaction.response.send_message(
-                f"✅ **{member.display_name}** has been muted.",
-                ephemeral=True,
-            )
+        notify = self._notify_member(interaction, member, "muted", reason) if notify_member else None
+
+        if await self._run_action(
+            interaction,
+            member.add_roles(muted_role, reason=reason),
+            notify,
+            verb="mute",
+            target=member,
+            success=f"✅ **{member.display_name}** has been muted.",
+            forbidden="❌ I don't have the permissions to assign the muted role.",
+        ):
             log.info("%s muted %s. Reason: %s", interaction.user, member, reason)
-        except discord.Forbidden:
-            await interaction.response.send_message(
-                "❌ I don't have the permissions to assign the muted role.",
-                ephemeral=True,
-            )
-        except discord.HTTPException as e:
-            await interaction.response.send_message(
-                f"A {e.status} {e.code} error has occurred.",
-                ephemeral=True,
-            )
-            log.exception("Failed to mute %s", member)
 
     @app_commands.command(
         name="unmute",
@@ -501,12 +542,13 @@ class Moderate(
     ) -> None:
         """Unmutes a member by removing the 'Muted' role."""
         # _pre_action_checks is handled by interaction_check
+        await interaction.response.defer(ephemeral=True)
         config = await self.config_db.get_guild_config(
             GuildId(interaction.guild.id),
         )
         muted_role_id = config.muted_role_id
         if not muted_role_id:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "The Muted Role has not been configured for this server. Use `/config set role`.",
                 ephemeral=True,
             )
@@ -514,7 +556,7 @@ class Moderate(
 
         muted_role = interaction.guild.get_role(muted_role_id)
         if not muted_role:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "The configured muted role could not be found on this server. It may have been deleted.",
                 ephemeral=True,
             )
@@ -524,34 +566,25 @@ class Moderate(
         # It will be caught by on_app_command_error if it fails.
         ensure_bot_hierarchy(interaction, muted_role)
 
-        if muted_role not in member.roles:
-            await interaction.response.send_message(
+        if not member.get_role(muted_role.id):
+            await interaction.followup.send(
                 "This member is not currently muted.",
                 ephemeral=True,
             )
             return
 
-        if notify_member:
-            await self._notify_member(interaction, member, "unmuted", reason)
-
-        try:
-            await member.remove_roles(muted_role, reason=reason)
-            await interaction.response.send_message(
-                f"✅ **{member.display_name}** has been unmuted.",
-                ephemeral=True,
-            )
+        notify = self._notify_member(interaction, member, "unmuted", reason) if notify_member else None
+
+        if await self._run_action(
+            interaction,
+            member.remove_roles(muted_role, reason=reason),
+            notify,
+            verb="unmute",
+            target=member,
+            success=f"✅ **{member.display_name}** has been unmuted.",
+            forbidden="❌ I don't have the permissions to remove the muted role.",
+        ):
             log.info("%s unmuted %s. Reason: %s", interaction.user, member, reason)
-        except discord.Forbidden:
-            await interaction.response.send_message(
-                "❌ I don't have the permissions to remove the muted role.",
-                ephemeral=True,
-            )
-        except discord.HTTPException as e:
-            await interaction.response.send_message(
-                f"A {e.status} {e.code} error has occurred.",
-                ephemeral=True,
-            )
-            log.exception("Failed to unmute %s", member)
 
 
 async def setup(bot: BotCore) -> None:
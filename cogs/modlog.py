@@ -1,20 +1,62 @@
 import asyncio
-import datetime
 import logging
 import time
-from typing import TYPE_CHECKING
+from functools import partial
+from typing import TYPE_CHECKING, Final
 
 import discord
 from discord.ext import commands
 
-from modules.dtypes import GuildId
+from modules.bounded_dict import BoundedDict
+from modules.dtypes import ChannelId, GuildId, RoleId
+from modules.embed_batcher import EmbedBatcher
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from modules.BotCore import BotCore
     from modules.ConfigDB import ConfigDB
 
 log = logging.getLogger(__name__)
 
+# (guild, action, target ID) an audit log entry is filed under
+type AuditKey = tuple[GuildId, discord.AuditLogAction, int]
+# Tells whether an audit log entry records the specific change being logged
+type AuditCheck = Callable[[discord.AuditLogEntry], bool]
+
+# How long a gateway audit log entry is kept, and how long a listener waits for its entry to arrive
+AUDIT_ENTRY_TTL_SECONDS: Final[float] = 5.0
+AUDIT_ENTRY_WAIT_SECONDS: Final[float] = 3.0
+# How long before its event an audit log entry may arrive and still be attributed to it
+AUDIT_ENTRY_LEAD_SECONDS: Final[float] = 2.0
+
+# Security alert embed colour per risk level
+RISK_COLORS: Final[dict[str, discord.Colour]] = {
+    "LOW": discord.Color.blue(),
+    "MEDIUM": discord.Color.orange(),
+    "HIGH": discord.Color.red(),
+    "CRITICAL": discord.Color.dark_red(),
+}
+DEFAULT_RISK_COLOR: Final[discord.Colour] = discord.Color.red()
+
+# Alert cooldowns remembered at once; the least recently raised alerts are forgotten first
+ALERT_COOLDOWN_MAX_ENTRIES: Final[int] = 10000
+
+
+def _changes_timeout(entry: discord.AuditLogEntry, *, timed_out: bool) -> bool:
+    """Whether the entry applies a timeout, or with `timed_out=False` lifts one."""
+    # AuditLogDiff only has the attributes that changed
+    if not hasattr(entry.after, "timed_out_until"):
+        return False
+    return (entry.after.timed_out_until is not None) == timed_out
+
+
+def _changes_role(entry: discord.AuditLogEntry, role_id: RoleId, *, added: bool) -> bool:
+    """Whether the entry adds the role, or with `added=False` removes it."""
+    # For member_role_update, `after.roles` holds the added roles and `before.roles` the removed ones
+    roles = getattr(entry.after if added else entry.before, "roles", ())
+    return any(role.id == role_id for role in roles)
+
 
 class ModLogCog(commands.Cog):
     """A cog for logging moderation actions to a specified channel."""
@@ -22,8 +64,19 @@ class ModLogCog(commands.Cog):
     def __init__(self, bot: BotCore, *, config_db: ConfigDB) -> None:
         self.bot = bot
         self.config_db = config_db
-        # Cooldown tracking for security alerts: {guild_id:warning_type: timestamp}
-        self._alert_cooldowns: dict[str, float] = {}
+        # Cooldown tracking for security alerts: {(guild_id, warning_type): monotonic timestamp}, oldest first
+        self._alert_cooldowns: BoundedDict[tuple[int, str], float] = BoundedDict(ALERT_COOLDOWN_MAX_ENTRIES)
+        # One sender per mod log channel, so actions logged during a send share the next message
+        self._log_batcher = EmbedBatcher(self._send_log_embeds)
+        self._log_channels: dict[ChannelId, discord.TextChannel] = {}
+        # Recent audit log entries with their monotonic arrival time, oldest first per key
+        self._recent_audit: dict[AuditKey, list[tuple[float, discord.AuditLogEntry]]] = {}
+        # Tasks waiting for an audit log entry to arrive, woken by `on_audit_log_entry_create`
+        self._audit_waiters: dict[AuditKey, list[asyncio.Event]] = {}
+
+    async def cog_unload(self) -> None:
+        """Stop the log senders."""
+        self._log_batcher.close()
 
     async def _log_action(
         self,
@@ -31,7 +84,7 @@ class ModLogCog(commands.Cog):
         title: str,
         color: discord.Colour,
         member: discord.User | discord.Member,
-        moderator: discord.User | None,
+        moderator: discord.abc.User | None,
         reason: str | None,
         duration: str | None = None,
         guild_id: GuildId | None = None,  # Added guild_id to fetch config dynamically
@@ -49,15 +102,12 @@ class ModLogCog(commands.Cog):
         embed = discord.Embed(
             title=title,
             color=color,
+            description=(
+                f"**Target:** {member.mention} (`{member.id}`)\n**Moderator:** {moderator.mention if moderator else 'Unknown'}"
+            ),
             timestamp=discord.utils.utcnow(),
         )
-
-        name = f"{member.name} ({member.display_name})"
-        embed.set_author(name=name, icon_url=member.display_avatar)
-
-        description = f"**Target:** {member.mention} (`{member.id}`)"
-        description += f"\n**Moderator:** {moderator.mention if moderator else 'Unknown'}"
-        embed.description = description
+        embed.set_author(name=f"{member.name} ({member.display_name})", icon_url=member.display_avatar)
 
         if include_reason:
             embed.add_field(
@@ -68,8 +118,8 @@ class ModLogCog(commands.Cog):
         if duration:
             embed.add_field(name="Ends On", value=duration, inline=False)
 
-        mod_channel = self.bot.get_channel(mod_channel_id)
-        if not isinstance(mod_channel, discord.TextChannel):
+        mod_channel = self._get_log_channel(mod_channel_id)
+        if mod_channel is None:
             log.warning(
                 "Configured mod log channel %d not found or is not a text channel for guild %d.",
                 mod_channel_id,
@@ -88,15 +138,27 @@ class ModLogCog(commands.Cog):
             )
             return
 
+        self._log_batcher.queue(mod_channel, embed)
+
+    def _get_log_channel(self, channel_id: ChannelId) -> discord.TextChannel | None:
+        channel = self._log_channels.get(channel_id)
+        if channel is None:
+            resolved = self.bot.get_channel(channel_id)
+            if not isinstance(resolved, discord.TextChannel):
+                return None
+            channel = self._log_channels[channel_id] = resolved
+        return channel
+
+    async def _send_log_embeds(self, mod_channel: discord.TextChannel, embeds: list[discord.Embed]) -> None:
         try:
             # Defensively disable all pings. Only display mentions.
-            await mod_channel.send(embed=embed, allowed_mentions=None)
+            await mod_channel.send(embeds=embeds, allowed_mentions=None)
         except discord.Forbidden, discord.HTTPException:
             # Log the exception but don't re-raise, as logging should not block other operations.
             log.exception("Failed to send log message to mod channel")
             self.bot.dispatch(
                 "security_alert",
-                guild_id=guild_id,
+                guild_id=mod_channel.guild.id,
                 risk_level="HIGH",
                 details=(
                     f"**Moderation Log Permission Error**\n"
@@ -111,17 +173,30 @@ class ModLogCog(commands.Cog):
         guild: discord.Guild,
         target: discord.User | discord.Member,
         action: discord.AuditLogAction,
-    ) -> tuple[discord.User | None, str | None]:
-        """Wait and fetch the moderator and reason from the audit log."""
-        await asyncio.sleep(3)  # Wait for the audit log to populate
-        THRESHOLD = 10
-        after = discord.utils.utcnow() - datetime.timedelta(seconds=THRESHOLD)
-        try:
-            async for entry in guild.audit_logs(action=action, after=after):
-                # Check if the entry is recent
-                if entry.target and entry.target.id == target.id:
-                    return entry.user, entry.reason
-        except discord.Forbidden:
+        *,
+        received: float,
+    ) -> tuple[discord.abc.User | None, str | None]:
+        """Wait for the moderator and reason from the audit log."""
+        entries = await self._fetch_audit_entries(guild, target, {action: None}, received=received)
+        return entries.get(action, (None, None))
+
+    async def _fetch_audit_entries(
+        self,
+        guild: discord.Guild,
+        target: discord.User | discord.Member,
+        checks: dict[discord.AuditLogAction, AuditCheck | None],
+        *,
+        received: float,
+    ) -> dict[discord.AuditLogAction, tuple[discord.abc.User | None, str | None]]:
+        """Wait for the audit log entries of each action on `target` and return their moderator and reason.
+
+        Entries arrive over the gateway (see `on_audit_log_entry_create`), so this only waits
+        for them to show up in `_recent_audit` instead of fetching the audit log. `received` is
+        the monotonic time the triggering event arrived; entries from well before it belong to
+        some earlier action and are ignored, as are entries the action's check rejects.
+        """
+        # Discord only sends audit log entries to bots that can view the audit log
+        if not guild.me.guild_permissions.view_audit_log:
             log.warning("Missing 'View Audit Log' permissions to identify moderator.")
             self.bot.dispatch(
                 "security_alert",
@@ -135,10 +210,94 @@ class ModLogCog(commands.Cog):
                 ),
                 warning_type="audit_log_permission",
             )
-        except discord.HTTPException, discord.errors.NotFound:
-            log.exception("Failed to fetch audit logs")
+            return {}
 
-        return None, None
+        since = received - AUDIT_ENTRY_LEAD_SECONDS
+        found: dict[discord.AuditLogAction, discord.AuditLogEntry] = {}
+        try:
+            async with asyncio.timeout(AUDIT_ENTRY_WAIT_SECONDS):
+                for action, check in checks.items():
+                    found[action] = await self._wait_for_audit_entry((GuildId(guild.id), action, target.id), since, check)
+        except TimeoutError:
+            # Entries for the actions not yet waited on may still have arrived in time
+            for action, check in checks.items():
+                if action not in found and (
+                    entry := self._take_audit_entry((GuildId(guild.id), action, target.id), since, check)
+                ):
+                    found[action] = entry
+
+        return {action: (await self._resolve_moderator(guild, entry), entry.reason) for action, entry in found.items()}
+
+    async def _resolve_moderator(self, guild: discord.Guild, entry: discord.AuditLogEntry) -> discord.abc.User | None:
+        """Return the user behind an audit log entry, fetching them if they aren't cached."""
+        # Gateway entries only fill `user` from the member cache, unlike those fetched from the audit log
+        if entry.user is not None or entry.user_id is None:
+            return entry.user
+        user = guild.get_member(entry.user_id) or self.bot.get_user(entry.user_id)
+        if user is not None:
+            return user
+        try:
+            return await self.bot.fetch_user(entry.user_id)
+        except discord.HTTPException:
+            log.warning("Failed to fetch moderator %s for audit log entry %s", entry.user_id, entry.id)
+            return None
+
+    def _take_audit_entry(self, key: AuditKey, since: float, check: AuditCheck | None) -> discord.AuditLogEntry | None:
+        """Remove and return the oldest entry for `key` that arrived at or after `since` and passes `check`."""
+        entries = self._recent_audit.get(key)
+        if not entries:
+            return None
+        for i, (arrived, entry) in enumerate(entries):
+            if arrived >= since and (check is None or check(entry)):
+                # Removed so a later action on the same member isn't attributed to this entry
+                del entries[i]
+                if not entries:
+                    del self._recent_audit[key]
+                return entry
+        return None
+
+    async def _wait_for_audit_entry(
+        self,
+        key: AuditKey,
+        since: float,
+        check: AuditCheck | None,
+    ) -> discord.AuditLogEntry:
+        """Wait until a matching audit log entry for `key` arrives, and take it."""
+        # Loops because another waiter may have taken the entry, or a non-matching one arrived
+        while (entry := self._take_audit_entry(key, since, check)) is None:
+            event = asyncio.Event()
+            waiters = self._audit_waiters.setdefault(key, [])
+            waiters.append(event)
+            try:
+                await event.wait()
+            finally:
+                # The listener removes the list when it wakes everyone, so only clean up after a timeout
+                if self._audit_waiters.get(key) is waiters:
+                    waiters.remove(event)
+                    if not waiters:
+                        del self._audit_waiters[key]
+        return entry
+
+    @commands.Cog.listener()
+    async def on_audit_log_entry_create(self, entry: discord.AuditLogEntry) -> None:
+        """Keep recent audit log entries so moderators can be looked up without fetching the audit log."""
+        if entry.target is None:
+            return
+
+        now = time.monotonic()
+        # Keys are kept in order of their latest entry, so expired ones are at the front
+        while self._recent_audit:
+            oldest = next(iter(self._recent_audit))
+            if now - self._recent_audit[oldest][-1][0] < AUDIT_ENTRY_TTL_SECONDS:
+                break
+            del self._recent_audit[oldest]
+
+        key = (GuildId(entry.guild.id), entry.action, entry.target.id)
+        entries = [recent for recent in self._recent_audit.pop(key, ()) if now - recent[0] < AUDIT_ENTRY_TTL_SECONDS]
+        entries.append((now, entry))
+        self._recent_audit[key] = entries
+        for event in self._audit_waiters.pop(key, ()):
+            event.set()
 
     @commands.Cog.listener()
     async def on_member_ban(
@@ -146,6 +305,7 @@ class ModLogCog(commands.Cog):
         guild: discord.Guild,
         user: discord.User | discord.Member,
     ) -> None:
+        received = time.monotonic()
         config = await self.config_db.get_guild_config(GuildId(guild.id))
         mod_channel_id = config.mod_log_channel_id
 
@@ -157,6 +317,7 @@ class ModLogCog(commands.Cog):
             guild,
             user,
             discord.AuditLogAction.ban,
+            received=received,
         )
         await self._log_action(
             title="Member Banned",
@@ -169,6 +330,7 @@ class ModLogCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_unban(self, guild: discord.Guild, user: discord.User) -> None:
+        received = time.monotonic()
         config = await self.config_db.get_guild_config(GuildId(guild.id))
         mod_channel_id = config.mod_log_channel_id
 
@@ -179,6 +341,7 @@ class ModLogCog(commands.Cog):
             guild,
             user,
             discord.AuditLogAction.unban,
+            received=received,
         )
         await self._log_action(
             title="Member Unbanned",
@@ -192,6 +355,7 @@ class ModLogCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member) -> None:
+        received = time.monotonic()
         config = await self.config_db.get_guild_config(GuildId(member.guild.id))
         mod_channel_id = config.mod_log_channel_id
 
@@ -202,6 +366,7 @@ class ModLogCog(commands.Cog):
             member.guild,
             member,
             discord.AuditLogAction.kick,
+            received=received,
         )
         # If a kick entry is found, it was a kick. Otherwise, it was a leave.
         if moderator:
@@ -220,87 +385,97 @@ class ModLogCog(commands.Cog):
         before: discord.Member,
         after: discord.Member,
     ) -> None:
+        # Most member updates (nicknames, avatars, ...) touch neither timeouts nor roles
+        timeout_changed = before.timed_out_until != after.timed_out_until
+        roles_changed = before.roles != after.roles
+        if not timeout_changed and not roles_changed:
+            return
+        received = time.monotonic()
+
         config = await self.config_db.get_guild_config(GuildId(before.guild.id))
         mod_channel_id = config.mod_log_channel_id
 
         if not mod_channel_id:
             return
 
-        if before.timed_out_until != after.timed_out_until:
+        # (title, colour, audit action, include_reason, duration) of each log this update produces
+        pending: list[tuple[str, discord.Colour, discord.AuditLogAction, bool, str | None]] = []
+        # Timeouts and mutes share their audit actions with unrelated member and role edits,
+        # so each action's entry must also show the specific change being logged
+        checks: dict[discord.AuditLogAction, AuditCheck | None] = {}
+
+        if timeout_changed:
             # Member Timed Out
             if not before.timed_out_until and after.timed_out_until:
-                moderator, reason = await self._fetch_audit_entry(
-                    after.guild,
-                    after,
-                    discord.AuditLogAction.member_update,
-                )
                 duration_str = f"{discord.utils.format_dt(after.timed_out_until, 'F')} \
 ({discord.utils.format_dt(after.timed_out_until, 'R')})"
-
-                await self._log_action(
-                    title="Member Timed Out",
-                    color=discord.Colour.gold(),
-                    member=after,
-                    moderator=moderator,
-                    reason=reason,
-                    guild_id=GuildId(after.guild.id),
-                    duration=duration_str,
+                pending.append(
+                    ("Member Timed Out", discord.Colour.gold(), discord.AuditLogAction.member_update, True, duration_str),
                 )
+                checks[discord.AuditLogAction.member_update] = partial(_changes_timeout, timed_out=True)
             # Timeout Removed
             elif before.timed_out_until and not after.timed_out_until:
-                moderator, reason = await self._fetch_audit_entry(
-                    after.guild,
-                    after,
-                    discord.AuditLogAction.member_update,
-                )
-                await self._log_action(
-                    title="Timeout Removed",
-                    color=discord.Colour.blue(),
-                    member=after,
-                    moderator=moderator,
-                    reason=reason,
-                    guild_id=GuildId(after.guild.id),
-                    include_reason=False,
-                )
+                pending.append(("Timeout Removed", discord.Colour.blue(), discord.AuditLogAction.member_update, False, None))
+                checks[discord.AuditLogAction.member_update] = partial(_changes_timeout, timed_out=False)
 
         # Muted Role Tracking
         muted_role_id = config.muted_role_id
-        if muted_role_id and before.roles != after.roles:
-            muted_role = after.guild.get_role(muted_role_id)
-            if not muted_role:
-                return
-
+        if muted_role_id and roles_changed:
+            # Member.get_role checks the member's sorted role IDs, and is None if the role no longer exists
+            was_muted = before.get_role(muted_role_id) is not None
+            is_muted = after.get_role(muted_role_id) is not None
             # Role added
-            if muted_role not in before.roles and muted_role in after.roles:
-                moderator, reason = await self._fetch_audit_entry(
-                    after.guild,
-                    after,
-                    discord.AuditLogAction.member_role_update,
-                )
-                await self._log_action(
-                    title="Member Muted",
-                    color=discord.Colour.dark_orange(),
-                    member=after,
-                    moderator=moderator,
-                    reason=reason,
-                    guild_id=GuildId(after.guild.id),
+            if is_muted and not was_muted:
+                pending.append(
+                    ("Member Muted", discord.Colour.dark_orange(), discord.AuditLogAction.member_role_update, True, None),
                 )
+                checks[discord.AuditLogAction.member_role_update] = partial(_changes_role, role_id=muted_role_id, added=True)
             # Role removed
-            elif muted_role in before.roles and muted_role not in after.roles:
-                moderator, reason = await self._fetch_audit_entry(
-                    after.guild,
-                    after,
-                    discord.AuditLogAction.member_role_update,
-                )
-                await self._log_action(
-                    title="Member Unmuted",
-                    color=discord.Colour.teal(),
-                    member=after,
-                    moderator=moderator,
-                    reason=reason,
-                    guild_id=GuildId(after.guild.id),
-                    include_reason=False,
+            elif was_muted and not is_muted:
+                pending.append(
+                    ("Member Unmuted", discord.Colour.teal(), discord.AuditLogAction.member_role_update, False, None),
                 )
+                checks[discord.AuditLogAction.member_role_update] = partial(_changes_role, role_id=muted_role_id, added=False)
+
+        if not pending:
+            return
+
+        # A timeout and a mute in the same update share one audit log read
+        entries = await self._fetch_audit_entries(after.guild, after, checks, received=received)
+        for title, color, action, include_reason, duration in pending:
+            moderator, reason = entries.get(action, (None, None))
+            await self._log_action(
+                title=title,
+                color=color,
+                member=after,
+                moderator=moderator,
+                reason=reason,
+                guild_id=GuildId(after.guild.id),
+                duration=duration,
+                include_reason=include_reason,
+            )
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        """Forget the alert cooldowns and log channels of a guild the bot has left."""
+        for key in [key for key in self._alert_cooldowns if key[0] == guild.id]:
+            del self._alert_cooldowns[key]
+        for channel in guild.channels:
+            self._forget_log_channel(ChannelId(channel.id))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        """Stop logging to a deleted channel."""
+        self._forget_log_channel(ChannelId(channel.id))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, _after: discord.abc.GuildChannel) -> None:
+        """Resolve a changed channel again on its next log line."""
+        self._log_channels.pop(ChannelId(before.id), None)
+
+    def _forget_log_channel(self, channel_id: ChannelId) -> None:
+        self._log_channels.pop(channel_id, None)
+        self._log_batcher.forget(channel_id)
 
     @commands.Cog.listener()
     async def on_security_alert(
@@ -325,15 +500,15 @@ class ModLogCog(commands.Cog):
         """
         # 1. Check Cooldown (if warning_type is provided)
         if warning_type:
-            now = time.time()
-            cooldown_key = f"{guild_id}:{warning_type}"
+            now = time.monotonic()
+            cooldown_key = (guild_id, warning_type)
             last_alert_time = self._alert_cooldowns.get(cooldown_key)
 
             if last_alert_time and (now - last_alert_time) < cooldown_seconds:
                 # Still on cooldown, skip this alert
                 return
 
-            # Update cooldown timestamp
+            # Update cooldown timestamp; the oldest alerts are evicted first
             self._alert_cooldowns[cooldown_key] = now
 
         # 2. Fetch the configuration for the specific guild
@@ -344,22 +519,16 @@ class ModLogCog(commands.Cog):
         if not channel_id:
             return
 
-        channel = self.bot.get_channel(channel_id)
-        if not isinstance(channel, discord.TextChannel):
+        channel = self._get_log_channel(channel_id)
+        if channel is None:
             return
 
         # 4. Format the Alert Embed
-        colors = {
-            "LOW": discord.Color.blue(),
-            "MEDIUM": discord.Color.orange(),
-            "HIGH": discord.Color.red(),
-            "CRITICAL": discord.Color.dark_red(),
-        }
-
+        risk_level = risk_level.upper()
         embed = discord.Embed(
-            title=f"🚨 Security Alert: {risk_level.upper()}",
+            title=f"🚨 Security Alert: {risk_level}",
             description=details,
-            color=colors.get(risk_level.upper(), discord.Color.red()),
+            color=RISK_COLORS.get(risk_level, DEFAULT_RISK_COLOR),
             timestamp=discord.utils.utcnow(),
         )
 
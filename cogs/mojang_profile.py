@@ -1,5 +1,7 @@
+import contextlib
 import logging
 import re
+import time
 from typing import TYPE_CHECKING, Final
 from uuid import UUID
 
@@ -8,26 +10,44 @@ from async_mojang import API
 from discord import app_commands
 from discord.ext import commands
 
+from modules.bounded_dict import BoundedDict
 from modules.exceptions import UserError
 
 if TYPE_CHECKING:
+    from async_mojang._types import UserProfile
+
     from modules.BotCore import BotCore
 
 log = logging.getLogger(__name__)
 
 _MC_NAME_RE: Final = re.compile(r"^[a-zA-Z0-9_]{3,16}$")
 _HEADS: Final = "https://mc-heads.net"
+# How long resolved UUIDs and profiles are reused, and how many of each are kept
+LOOKUP_CACHE_TTL_SECONDS: Final[float] = 3600.0
+LOOKUP_CACHE_MAX_ENTRIES: Final[int] = 1024
+
+
+def _cache_get[K, V](cache: dict[K, tuple[float, V]], key: K) -> V | None:
+    """Return the value cached under *key*, or None if it is missing or expired."""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() - entry[0] >= LOOKUP_CACHE_TTL_SECONDS:
+        del cache[key]
+        return None
+    return entry[1]
 
 
 def _validate_player(value: str) -> UUID | str:
     """Parse *value* as a UUID or validate it as a Minecraft username."""
+    # Usernames (at most 16 characters) can never be UUIDs, so check them first and skip UUID's ValueError
+    if _MC_NAME_RE.fullmatch(value):
+        return value
     try:
         return UUID(value)
     except ValueError as err:
-        if not _MC_NAME_RE.fullmatch(value):
-            msg = f"`{value}` is not a valid Minecraft username or UUID."
-            raise app_commands.TransformerError(msg) from err
-        return value
+        msg = f"`{value}` is not a valid Minecraft username or UUID."
+        raise app_commands.TransformerError(msg) from err
 
 
 class PlayerTransformer(app_commands.Transformer):
@@ -42,9 +62,42 @@ Player = app_commands.Transform[UUID | str, PlayerTransformer]
 
 class MojangProfile(commands.Cog):
     bot: BotCore
+    _api: API
 
     def __init__(self, bot: BotCore) -> None:
         self.bot = bot
+        # Lower-cased username → UUID, and UUID → profile, with the monotonic time they were fetched
+        self._uuid_cache: BoundedDict[str, tuple[float, UUID]] = BoundedDict(LOOKUP_CACHE_MAX_ENTRIES)
+        self._profile_cache: BoundedDict[UUID, tuple[float, UserProfile]] = BoundedDict(LOOKUP_CACHE_MAX_ENTRIES)
+
+    async def cog_load(self) -> None:
+        # One client for the cog's lifetime so lookups reuse pooled connections
+        self._api_stack = contextlib.AsyncExitStack()
+        self._api = await self._api_stack.enter_async_context(API())
+
+    async def cog_unload(self) -> None:
+        """Close the Mojang API session."""
+        await self._api_stack.aclose()
+
+    async def _get_uuid(self, username: str) -> UUID | None:
+        """Resolve a username to a UUID, reusing recent lookups."""
+        # Minecraft usernames are case-insensitive
+        key = username.lower()
+        player_uuid = _cache_get(self._uuid_cache, key)
+        if player_uuid is None:
+            player_uuid = await self._api.get_uuid(username)
+            if player_uuid is not None:
+                self._uuid_cache[key] = (time.monotonic(), player_uuid)
+        return player_uuid
+
+    async def _get_profile(self, player_uuid: UUID) -> UserProfile | None:
+        """Fetch a player's profile, reusing recent lookups."""
+        profile = _cache_get(self._profile_cache, player_uuid)
+        if profile is None:
+            profile = await self._api.get_profile(player_uuid)
+            if profile is not None:
+                self._profile_cache[player_uuid] = (time.monotonic(), profile)
+        return profile
 
     @commands.hybrid_command(
         name="mojangprofile",
@@ -53,19 +106,18 @@ class MojangProfile(commands.Cog):
     @commands.cooldown(3, 10, commands.BucketType.user)
     @app_commands.describe(player="Minecraft username or UUID")
     async def mojangprofile(self, ctx: commands.Context, *, player: Player) -> None:
-        async with API() as api:
-            match player:
-                case UUID() as uuid:
-                    profile = await api.get_profile(uuid)
-                case str() as username:
-                    player_uuid = await api.get_uuid(username)
-                    if player_uuid is None:
-                        msg = f"Player `{username}` not found."
-                        raise UserError(msg)
-                    profile = await api.get_profile(player_uuid)
-                case _:
-                    msg = "Invalid input. Provide an MC username or UUID."
+        match player:
+            case UUID() as uuid:
+                profile = await self._get_profile(uuid)
+            case str() as username:
+                player_uuid = await self._get_uuid(username)
+                if player_uuid is None:
+                    msg = f"Player `{username}` not found."
                     raise UserError(msg)
+                profile = await self._get_profile(player_uuid)
+            case _:
+                msg = "Invalid input. Provide an MC username or UUID."
+                raise UserError(msg)
 
         if profile is None:
             msg = f"Profile not found for `{player}`."
@@ -78,8 +130,9 @@ class MojangProfile(commands.Cog):
             color=discord.Colour.green(),
             timestamp=discord.utils.utcnow(),
         )
-        embed.set_author(name=profile.name, icon_url=f"{_HEADS}/avatar/{profile.id.hex}/64")
-        embed.set_thumbnail(url=f"{_HEADS}/body/{profile.id.hex}")
+        hex_id = profile.id.hex
+        embed.set_author(name=profile.name, icon_url=f"{_HEADS}/avatar/{hex_id}/64")
+        embed.set_thumbnail(url=f"{_HEADS}/body/{hex_id}")
         embed.add_field(name="UUID", value=f"`{uid}`", inline=False)
         embed.add_field(
             name="Skin",
@@ -1,24 +1,26 @@
+import asyncio
 import logging
 import re
 import time
-from collections import defaultdict
-from typing import TYPE_CHECKING, TypedDict, cast, override
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Final, NamedTuple, cast, override
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 from modules.clean_string import sanitize_chat
-from modules.dtypes import AnalysisStatus, MessageId, is_guild_message
+from modules.dtypes import AnalysisStatus, GuildId, MessageId, UserId, is_guild_message
 from modules.security_utils import check_bot_hierarchy, check_verifiable_role
 
 if TYPE_CHECKING:
     from modules.BotCore import BotCore
 
-# A structured dictionary for analysis results, improving code clarity.
+# A structured tuple for analysis results, improving code clarity.
 
 
-class AnalysisResult(TypedDict):
+class AnalysisResult(NamedTuple):
     """Represents the analysis of a single line in a reaction role message."""
 
     status: AnalysisStatus
@@ -28,29 +30,99 @@ class AnalysisResult(TypedDict):
     error_message: str | None
 
 
-# Regex to find custom emojis (<:name:id> or <a:name:id>) and a broad range of Unicode emojis.
+@dataclass(slots=True)
+class MessageAnalysis:
+    """The analysed lines of a reaction role message, plus the valid roles keyed by emoji."""
+
+    results: list[AnalysisResult] = field(default_factory=list)
+    # Only lines with status "OK", keyed by `_emoji_key`; the first line wins if an emoji is listed twice
+    roles_by_emoji: dict[int | str, discord.Role] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class PendingRoleChanges:
+    """Reaction role changes queued for one member until the batching window passes."""
+
+    member: discord.Member
+    add: dict[int, discord.Role] = field(default_factory=dict)
+    remove: dict[int, discord.Role] = field(default_factory=dict)
+    message_ids: set[int] = field(default_factory=set)
+
+
+# Pattern for custom emojis (<:name:id> or <a:name:id>) and a broad range of Unicode emojis.
 # While not 100% exhaustive of all Unicode emojis, this covers the vast majority.
-EMOJI_REGEX = re.compile(
+EMOJI_PATTERN: Final[str] = (
     r"<a?:\w+:\d+>|"
-    r"[\U0001F1E6-\U0001F1FF]|"  # flags (iOS)
-    r"[\U0001F300-\U0001F5FF]|"  # symbols & pictographs
-    r"[\U0001F600-\U0001F64F]|"  # emoticons
-    r"[\U0001F680-\U0001F6FF]|"  # transport & map symbols
-    r"[\U0001F700-\U0001F77F]|"  # alchemical symbols
-    r"[\U0001F780-\U0001F7FF]|"  # Geometric Shapes Extended
-    r"[\U0001F800-\U0001F8FF]|"  # Supplemental Arrows-C
-    r"[\U0001F900-\U0001F9FF]|"  # Supplemental Symbols and Pictographs
-    r"[\U0001FA00-\U0001FA6F]|"  # Chess Symbols
-    r"[\U0001FA70-\U0001FAFF]|"  # Symbols and Pictographs Extended-A
-    r"[\u2600-\u26FF]|"  # miscellaneous symbols
-    r"[\u2700-\u27BF]|"  # dingbats
-    r"[\u2B50]",  # star
+    # One character class so the regex engine does a single set test per character
+    r"["
+    r"\U0001F1E6-\U0001F1FF"  # flags (iOS)
+    r"\U0001F300-\U0001F64F"  # symbols & pictographs, emoticons
+    r"\U0001F680-\U0001FAFF"  # transport & map symbols through Symbols and Pictographs Extended-A
+    r"\u2600-\u27BF"  # miscellaneous symbols, dingbats
+    r"\u2B50"  # star
+    r"]"
 )
-ROLE_MENTION_REGEX = re.compile(r"<@&(\d+)>")
+# Finds emojis and role mentions in one pass; `lastgroup` tells which one matched
+REACTION_LINE_REGEX = re.compile(rf"(?P<emoji>{EMOJI_PATTERN})|<@&(?P<role>\d+)>")
+# How long a member's reaction role changes are collected before being sent as one request
+ROLE_CHANGE_BATCH_SECONDS: Final[float] = 0.1
+# Debug report group headers; ERROR and WARN groups are further split by their error message
+STATUS_HEADERS: Final[dict[AnalysisStatus, str]] = {
+    "OK": "✅ **VALID**",
+    "ERROR": "❌ **ERROR**",
+    "WARN": "⚠️ **WARN**",
+}
 
 log = logging.getLogger(__name__)
 
 
+def _scan_line(line: str) -> tuple[list[str], list[str]]:
+    """Return the emojis and the mentioned role IDs in a line.
+
+    Stops at the second emoji or role, since such a line is invalid however many more it has.
+    """
+    emojis: list[str] = []
+    role_ids: list[str] = []
+    for match in REACTION_LINE_REGEX.finditer(line):
+        if match.lastgroup == "role":
+            role_ids.append(match["role"])
+        else:
+            emojis.append(match[0])
+        if len(emojis) > 1 or len(role_ids) > 1:
+            break
+    return emojis, role_ids
+
+
+def _emoji_key(emoji_str: str) -> int | str:
+    """Return a custom emoji's ID, or a Unicode emoji itself, matching `PartialEmoji.id or PartialEmoji.name`."""
+    if emoji_str.startswith("<"):
+        return int(emoji_str[emoji_str.rindex(":") + 1 : -1])
+    return emoji_str
+
+
+def _check_role(
+    guild: discord.Guild,
+    role_id: str,
+) -> tuple[AnalysisStatus, discord.Role | None, str | None]:
+    """Return the status, role and error message of a role mentioned on a reaction role line."""
+    role = guild.get_role(int(role_id))
+    if not role:
+        return "WARN", None, f"Role with ID {role_id} not found."
+
+    # Security Check: Use centralized boolean function
+    safe_result = check_verifiable_role(role)
+    if not safe_result.ok:
+        return "ERROR", role, safe_result.reason  # Use the message from our util
+
+    # Bot Hierarchy Check: Use centralized boolean function
+    hierarchy_result = check_bot_hierarchy(guild, role)
+    if not hierarchy_result.ok:
+        return "ERROR", role, hierarchy_result.reason  # Use the message from our util
+
+    # If all checks pass
+    return "OK", role, None
+
+
 class ReactionRoles(commands.Cog):
     """Reaction role system for reactions on admin-authored messages.
 
@@ -60,11 +132,18 @@ class ReactionRoles(commands.Cog):
     def __init__(self, bot: BotCore) -> None:
         self.bot = bot
         # Message Caching
-        self.analysis_cache: dict[MessageId, list[AnalysisResult]] = {}
+        self.analysis_cache: OrderedDict[MessageId, MessageAnalysis] = OrderedDict()
         self.MAX_CACHE_SIZE = 128
         self.COOLDOWN_DURATION = 1.5  # seconds
-        self.user_reaction_cooldowns: dict[tuple[int, int, str], float] = {}
+        # Keyed by (message ID, user ID, hash of the emoji's ID or character)
+        self.user_reaction_cooldowns: OrderedDict[tuple[int, int, int], float] = OrderedDict()
         self.MAX_COOLDOWN_CACHE_SIZE = 1024
+        # Messages whose analysis found no valid role lines, so reactions on them skip all API calls
+        self.non_rr_messages: OrderedDict[MessageId, None] = OrderedDict()
+        self.MAX_NON_RR_CACHE_SIZE = 4096
+        # Role changes waiting for their member's batching window, and the tasks that will apply them
+        self._pending_role_changes: dict[tuple[GuildId, UserId], PendingRoleChanges] = {}
+        self._role_change_tasks: set[asyncio.Task[None]] = set()
 
         self.debug_reaction_role_menu = app_commands.ContextMenu(
             name="Debug Reaction Role",
@@ -74,132 +153,108 @@ class ReactionRoles(commands.Cog):
 
     @override
     async def cog_unload(self) -> None:
-        """Remove the context menu command when the cog is unloaded."""
+        """Remove the context menu command and stop pending role changes when the cog is unloaded."""
         self.bot.tree.remove_command(
             self.debug_reaction_role_menu.name,
             type=self.debug_reaction_role_menu.type,
         )
+        for task in self._role_change_tasks:
+            task.cancel()
 
     async def _analyze_reaction_message(
         self,
         message: discord.Message,
-    ) -> list[AnalysisResult]:
+        content: str | None = None,
+    ) -> MessageAnalysis:
         """Analyze a message to determine its validity as a reaction role message.
 
         Caches results to avoid re-computing for the same message.
         This is the single source of truth for all reaction role logic.
+        Pass `content` if the caller has already run `sanitize_chat` on the message.
 
         Returns
         -------
-            A list of AnalysisResult dictionaries, one for each parsed line.
-            Returns an empty list if the message author is not an administrator.
+            A MessageAnalysis with one AnalysisResult for each parsed line.
+            Its results are empty if the message author is not an administrator.
 
         """
         message_id = MessageId(message.id)
-        # 1. Check Cache
-        if message_id in self.analysis_cache:
-            return self.analysis_cache[message_id]
+        # 1. Check Cache, marking the message as recently used
+        if (cached := self.analysis_cache.get(message_id)) is not None:
+            self.analysis_cache.move_to_end(message_id)
+            return cached
 
         # The rest of the function performs the analysis if not found in cache.
         # This is the single source of truth for all reaction role logic.
 
         # 2. Perform Analysis
-        results: list[AnalysisResult] = []
+        analysis = MessageAnalysis()
+        results = analysis.results
         if not is_guild_message(message):
-            return []
+            return analysis
 
         # 1. Author Validation: Must be an manage_roles.
         if not message.author.guild_permissions.manage_roles:  # ty now knows message.author is a Member
-            return []
+            return analysis
+
+        # Role ID → (status, role, error message), shared by every line naming that role
+        verdicts: dict[str, tuple[AnalysisStatus, discord.Role | None, str | None]] = {}
 
         # 3. Line-by-Line Analysis
-        for line in sanitize_chat(message.content).splitlines():
+        if content is None:
+            content = sanitize_chat(message.content)
+        for line in content.splitlines():
             clean_line = line.strip()
-            if not clean_line:
+            # Lines without a role mention are headers or descriptions, not role lines
+            if "<@&" not in clean_line:
                 continue
 
-            role_mentions = ROLE_MENTION_REGEX.findall(clean_line)
-            emojis_found = EMOJI_REGEX.findall(clean_line)
+            emojis_found, role_mentions = _scan_line(clean_line)
 
             if len(emojis_found) != 1 or len(role_mentions) != 1:
                 results.append(
-                    {
-                        "status": "WARN",
-                        "line_content": clean_line,
-                        "emoji_str": emojis_found[0] if emojis_found else None,
-                        "role": None,
-                        "error_message": "Line must contain exactly one emoji and one role mention.",
-                    },
+                    AnalysisResult(
+                        status="WARN",
+                        line_content=clean_line,
+                        emoji_str=emojis_found[0] if emojis_found else None,
+                        role=None,
+                        error_message="Line must contain exactly one emoji and one role mention.",
+                    ),
                 )
                 continue
 
             emoji_str = emojis_found[0]
-            role = message.guild.get_role(int(role_mentions[0]))
-
-            if not role:
-                results.append(
-                    {
-                        "status": "WARN",
-                        "line_content": clean_line,
-                        "emoji_str": emoji_str,
-                        "role": None,
-                        "error_message": f"Role with ID {role_mentions[0]} not found.",
-                    },
-                )
-                continue
-
-            # 4. Security Check: Use centralized boolean function
-            safe_result = check_verifiable_role(role)
-            if not safe_result.ok:
-                results.append(
-                    {
-                        "status": "ERROR",
-                        "line_content": clean_line,
-                        "emoji_str": emoji_str,
-                        "role": role,
-                        "error_message": safe_result.reason,  # Use the message from our util
-                    },
-                )
-                continue
-
-            # 5. Bot Hierarchy Check: Use centralized boolean function
-            hierarchy_result = check_bot_hierarchy(message.guild, role)
-            if not hierarchy_result.ok:
-                results.append(
-                    {
-                        "status": "ERROR",
-                        "line_content": clean_line,
-                        "emoji_str": emoji_str,
-                        "role": role,
-                        "error_message": hierarchy_result.reason,  # Use the message from our util
-                    },
-                )
-                continue
-
-            # If all checks pass
+            role_id = role_mentions[0]
+            # 4. Role and security checks, once per distinct role in the message
+            if (verdict := verdicts.get(role_id)) is None:
+                verdict = verdicts[role_id] = _check_role(message.guild, role_id)
+            status, role, error_message = verdict
+
+            if status == "OK" and role:
+                analysis.roles_by_emoji.setdefault(_emoji_key(emoji_str), role)
             results.append(
-                {
-                    "status": "OK",
-                    "line_content": clean_line,
-                    "emoji_str": emoji_str,
-                    "role": role,
-                    "error_message": None,
-                },
+                AnalysisResult(
+                    status=status,
+                    line_content=clean_line,
+                    emoji_str=emoji_str,
+                    role=role,
+                    error_message=error_message,
+                ),
             )
 
-        # 6. Manage Cache Size and Store Result
-        if len(self.analysis_cache) >= self.MAX_CACHE_SIZE:
-            # Remove the oldest item (FIFO)
-            del self.analysis_cache[next(iter(self.analysis_cache))]
-
-        self.analysis_cache[message_id] = results
-        return results
+        # 5. Store Result and evict the least recently used message
+        self.analysis_cache[message_id] = analysis
+        if len(self.analysis_cache) > self.MAX_CACHE_SIZE:
+            self.analysis_cache.popitem(last=False)
+        return analysis
 
     @commands.Cog.listener()
     @override
     async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
         """Invalidate the cache if a potential reaction role message is edited."""
         message_id = MessageId(payload.message_id)
+        # An edit may turn any message into a reaction role message
+        self.non_rr_messages.pop(message_id, None)
         if message_id in self.analysis_cache:
             del self.analysis_cache[message_id]
             log.info(
@@ -229,29 +284,30 @@ class ReactionRoles(commands.Cog):
         self,
         user_id: int,
         message_id: int,
-        emoji_str: str,
+        emoji_hash: int,
     ) -> bool:
         """Check and update the per-user, per-reaction cooldown."""
-        key = (message_id, user_id, emoji_str)
-        current_time = time.time()
-
-        if last_event_time := self.user_reaction_cooldowns.get(key):
-            time_since = current_time - last_event_time
-            if time_since < self.COOLDOWN_DURATION:
-                log.debug(
-                    "User %d on cooldown for reaction %s on message %d.",
-                    user_id,
-                    emoji_str,
-                    message_id,
-                )
-                return True  # User is on cooldown
+        key = (message_id, user_id, emoji_hash)
+        current_time = time.monotonic()
+        cooldowns = self.user_reaction_cooldowns
+
+        # Timestamps are stored in order, so expired cooldowns are always at the front
+        while cooldowns and current_time - next(iter(cooldowns.values())) >= self.COOLDOWN_DURATION:
+            cooldowns.popitem(last=False)
 
-        # Manage cache size
-        if len(self.user_reaction_cooldowns) >= self.MAX_COOLDOWN_CACHE_SIZE:
-            del self.user_reaction_cooldowns[next(iter(self.user_reaction_cooldowns))]
+        # Anything left is still cooling down
+        if key in cooldowns:
+            log.debug(
+                "User %d on cooldown for a reaction on message %d.",
+                user_id,
+                message_id,
+            )
+            return True  # User is on cooldown
 
-        # Update timestamp
-        self.user_reaction_cooldowns[key] = current_time
+        # Record the timestamp; the cap only matters if more reactions arrive within one cooldown
+        cooldowns[key] = current_time
+        if len(cooldowns) > self.MAX_COOLDOWN_CACHE_SIZE:
+            cooldowns.popitem(last=False)
         return False  # User is not on cooldown
 
     async def _fetch_reaction_context(
@@ -267,22 +323,28 @@ class ReactionRoles(commands.Cog):
         if not guild:
             return None
 
-        # Local cache check first to reduce API calls
-        if (member := guild.get_member(payload.user_id)) is None:
+        # Local cache check first to reduce API calls; reaction adds already carry the member
+        if (member := payload.member or guild.get_member(payload.user_id)) is None:
             try:
                 member = await guild.fetch_member(payload.user_id)
-            except discord.NotFound:
-                log.debug("Member %d not found in guild %d.", payload.user_id, guild.id)
+            except discord.HTTPException:
+                log.debug("Could not fetch member %d in guild %d.", payload.user_id, guild.id)
                 return None
 
+        # Recent messages are kept up to date in discord.py's message cache
+        if (message := discord.utils.get(self.bot.cached_messages, id=payload.message_id)) is not None:
+            return guild, member, message
+
         try:
-            if (channel := self.bot.get_channel(payload.channel_id)) is None:
+            # The guild's own channel map avoids searching every guild the bot is in
+            if (channel := guild.get_channel_or_thread(payload.channel_id)) is None:
                 channel = await self.bot.fetch_channel(payload.channel_id)
 
             message = await cast("discord.TextChannel", channel).fetch_message(
                 payload.message_id,
             )
-        except discord.NotFound, discord.Forbidden:
+        # NotFound and Forbidden are the usual causes, but a transient 5xx shouldn't escape the listener either
+        except discord.HTTPException:
             log.debug(
                 "Could not fetch message %d from channel %d.",
                 payload.message_id,
@@ -346,36 +408,57 @@ class ReactionRoles(commands.Cog):
 
         return True
 
-    async def _apply_reaction_role_change(
+    def _apply_reaction_role_change(
         self,
         member: discord.Member,
         role: discord.Role,
         event_type: str,
         message_id: int,
     ) -> None:
-        """Add or remove the target role from the member."""
+        """Queue adding or removing the target role, so a member's quick successive reactions share one request."""
+        key = (GuildId(member.guild.id), UserId(member.id))
+        if (pending := self._pending_role_changes.get(key)) is None:
+            pending = self._pending_role_changes[key] = PendingRoleChanges(member)
+            task = asyncio.create_task(self._flush_role_changes(key))
+            self._role_change_tasks.add(task)
+            task.add_done_callback(self._role_change_tasks.discard)
+
+        # The latest reaction for a role wins
+        if event_type == "REACTION_ADD":
+            pending.remove.pop(role.id, None)
+            pending.add[role.id] = role
+        elif event_type == "REACTION_REMOVE":
+            pending.add.pop(role.id, None)
+            pending.remove[role.id] = role
+        pending.message_ids.add(message_id)
+
+    async def _flush_role_changes(self, key: tuple[GuildId, UserId]) -> None:
+        """Apply a member's queued role changes once the batching window has passed."""
+        await asyncio.sleep(ROLE_CHANGE_BATCH_SECONDS)
+        pending = self._pending_role_changes.pop(key)
+        # The cached member is kept current by the gateway; the queued one may be a snapshot from the event
+        member = pending.member.guild.get_member(pending.member.id) or pending.member
+        to_add = [role for role in pending.add.values() if member.get_role(role.id) is None]
+        to_remove = [role for role in pending.remove.values() if member.get_role(role.id) is not None]
+        if not to_add and not to_remove:
+            return
+
+        reason = f"Reaction Role {', '.join(map(str, sorted(pending.message_ids)))}"
         try:
-            reason = f"Reaction Role {message_id}"
-            if event_type == "REACTION_ADD":
-                await member.add_roles(role, reason=reason)
-                log.info(
-                    "Added role '%s' to '%s' in guild '%s'",
-                    role.name,
-                    member.display_name,
-                    member.guild.name,
-                )
-            elif event_type == "REACTION_REMOVE":
-                await member.remove_roles(role, reason=reason)
-                log.info(
-                    "Removed role '%s' from '%s' in guild '%s'",
-                    role.name,
-                    member.display_name,
-                    member.guild.name,
-                )
+            if len(to_add) + len(to_remove) > 1:
+                removed_ids = {role.id for role in to_remove}
+                roles = [role for role in member.roles[1:] if role.id not in removed_ids]
+                await member.edit(roles=[*roles, *to_add], reason=reason)
+            # A single change uses the per-role endpoint, which can't overwrite concurrent role edits
+            elif to_add:
+                await member.add_roles(*to_add, reason=reason)
+            else:
+                await member.remove_roles(*to_remove, reason=reason)
         except discord.Forbidden:
+            changed = [*to_add, *to_remove]
             log.warning(
-                "Failed to modify role '%s' for '%s'. Check permissions and role hierarchy.",
-                role.name,
+                "Failed to modify roles %s for '%s'. Check permissions and role hierarchy.",
+                ", ".join(f"'{role.name}'" for role in changed),
                 member.display_name,
             )
             self.bot.dispatch(
@@ -384,66 +467,56 @@ class ReactionRoles(commands.Cog):
                 risk_level="HIGH",
                 details=(
                     f"**Reaction Role Permission Error**\n"
-                    f"I failed to assign/remove the reaction role {role.mention} "
+                    f"I failed to assign/remove the reaction role(s) {' '.join(role.mention for role in changed)} "
                     f"for {member.mention}.\n\n"
                     "**Reason**: `discord.Forbidden`. This is a role hierarchy "
-                    f"problem. Please ensure my bot role is higher than the `{role.name}` role."
+                    "problem. Please ensure my bot role is higher than these roles."
                 ),
                 warning_type="reaction_role_permission",
             )
         except discord.HTTPException:
             log.exception(
-                "Network error while modifying role for '%s'",
+                "Network error while modifying roles for '%s'",
                 member.display_name,
             )
-
-    async def _process_reaction_analysis(
-        self,
-        analysis_results: list[AnalysisResult],
-        guild: discord.Guild,
-        member: discord.Member,
-        emoji_str: str,
-        event_type: str,
-        message_id: int,
-    ) -> None:
-        """Iterate analysis results and apply the correct role change."""
-        for result in analysis_results:
-            if result["status"] == "OK" and result["emoji_str"] == emoji_str:
-                target_role = cast("discord.Role", result["role"])
-
-                # Run security validation
-                if not await self._validate_role_for_assignment(
-                    guild,
-                    member,
-                    target_role,
-                ):
-                    continue  # Role is not safe, skip
-
-                # All checks passed, apply the role change
-                await self._apply_reaction_role_change(
-                    member,
-                    target_role,
-                    event_type,
-                    message_id,
+        else:
+            for role in to_add:
+                log.info(
+                    "Added role '%s' to '%s' in guild '%s'",
+                    role.name,
+                    member.display_name,
+                    member.guild.name,
+                )
+            for role in to_remove:
+                log.info(
+                    "Removed role '%s' from '%s' in guild '%s'",
+                    role.name,
+                    member.display_name,
+                    member.guild.name,
                 )
-                # Found our match, no need to check other lines.
-                break
 
     async def _handle_reaction_event(
         self,
         payload: discord.RawReactionActionEvent,
     ) -> None:
         """Shared logic for processing both reaction add and remove events."""
-        # 1. Initial Guard Clauses
-        if not self.bot.user or not payload.guild_id or payload.user_id == self.bot.user.id:
+        # 1. Initial Guard Clauses, including messages already known not to be reaction role messages
+        if (
+            not self.bot.user
+            or not payload.guild_id
+            or payload.user_id == self.bot.user.id
+            or MessageId(payload.message_id) in self.non_rr_messages
+        ):
             return
 
         user_id = payload.user_id
         message_id = payload.message_id
-        emoji_str = str(payload.emoji)
+        # Compare by ID or character rather than formatting the emoji as a string
+        emoji = payload.emoji
+        emoji_key = emoji.id or emoji.name or ""
 
         # 2. Cooldown Check
-        if self._is_user_on_cooldown(user_id, message_id, emoji_str):
+        if self._is_user_on_cooldown(user_id, message_id, hash(emoji_key)):
             return
 
         # 3. Fetch Discord Objects
@@ -453,24 +526,40 @@ class ReactionRoles(commands.Cog):
         guild, member, message = context
 
         # 4. Quick check: Is the emoji even in the message?
-        if emoji_str not in sanitize_chat(message.content):
+        content = sanitize_chat(message.content)
+        if str(emoji_key) not in content:
+            # Without any role mention the message has no role lines, whichever emoji is used
+            if "<@&" not in content:
+                self._remember_non_rr_message(MessageId(message.id))
             return
 
-        # 5. Get (or compute) message analysis
-        analysis_results = await self._analyze_reaction_message(message)
-        if not analysis_results:
+        # 5. Get (or compute) message analysis and look up the emoji's role
+        analysis = await self._analyze_reaction_message(message, content)
+        target_role = analysis.roles_by_emoji.get(emoji_key)
+        if target_role is None:
+            # Only skip messages with no role lines at all: a panel whose lines are all ERROR/WARN,
+            # or whose author lacks Manage Roles, can become valid once the permissions are fixed
+            if "<@&" not in content:
+                self._remember_non_rr_message(MessageId(message.id))
             return
 
-        # 6. Process the results and apply role changes
-        await self._process_reaction_analysis(
-            analysis_results,
-            guild,
+        # 6. Run security validation, then apply the role change
+        if not await self._validate_role_for_assignment(guild, member, target_role):
+            return
+        self._apply_reaction_role_change(
             member,
-            emoji_str,
+            target_role,
             payload.event_type,
             payload.message_id,
         )
 
+    def _remember_non_rr_message(self, message_id: MessageId) -> None:
+        """Record a message with no role lines, evicting the least recently added one."""
+        self.non_rr_messages[message_id] = None
+        self.non_rr_messages.move_to_end(message_id)
+        if len(self.non_rr_messages) > self.MAX_NON_RR_CACHE_SIZE:
+            self.non_rr_messages.popitem(last=False)
+
     @staticmethod
     def _format_analysis_report(
         analysis: list[AnalysisResult],
@@ -479,20 +568,18 @@ class ReactionRoles(commands.Cog):
         if not analysis:
             return [
                 "⚠️ This message is **not a valid reaction role message**.\n"
-                "(Reason: The message author does not have `Manage Roles` permissions).",
+                "(Reason: The message author does not have `Manage Roles` permissions, "
+                "or no line mentions a role).",
             ]
 
         report_lines: list[str] = []
         aggregated_results: defaultdict[str, list[str]] = defaultdict(list)
 
         for result in analysis:
-            line = result["line_content"]
-            status_map = {
-                "OK": "✅ **VALID**",
-                "ERROR": f"❌ **ERROR**: {result['error_message']}",
-                "WARN": f"⚠️ **WARN**: {result['error_message']}",
-            }
-            aggregated_results[status_map[result["status"]]].append(line)
+            header = STATUS_HEADERS[result.status]
+            if result.status != "OK":
+                header = f"{header}: {result.error_message}"
+            aggregated_results[header].append(result.line_content)
 
         for header, lines in aggregated_results.items():
             report_lines.extend([f"\n{header}", "```", *lines, "```"])
@@ -526,9 +613,12 @@ class ReactionRoles(commands.Cog):
                 "❌ **CRITICAL: I do not have the `Manage Roles` permission! I cannot assign or remove any roles.**\n",
             )
 
+        # Re-analyse from scratch so a fixed role or permission shows up, for reactions too
+        self.analysis_cache.pop(MessageId(message.id), None)
+        self.non_rr_messages.pop(MessageId(message.id), None)
         analysis = await self._analyze_reaction_message(message)
 
-        report_lines.extend(self._format_analysis_report(analysis))
+        report_lines.extend(self._format_analysis_report(analysis.results))
         report = "\n".join(report_lines)
         log.info(report)
 
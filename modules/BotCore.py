@@ -198,6 +198,10 @@ class BotCore(commands.Bot):
                 len(synced),
                 [i.name for i in synced],
             )
+            help_instance = self.get_cog("Help")
+            if help_instance:
+                # The sync response already carries the command IDs /help links to
+                cast("Help", help_instance).cache_server_commands(synced)
         except (
             HTTPException,
             CommandSyncFailure,
@@ -11,6 +11,7 @@ for frequently accessed settings.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass, fields
 from typing import TYPE_CHECKING, ClassVar, Self
@@ -98,6 +99,8 @@ class ConfigDB:
     def __init__(self, database: Database) -> None:
         self.database = database
         self._cache: dict[GuildId, GuildConfig] = {}
+        # Serializes cache misses per guild so a burst of events loads the row once
+        self._load_locks: dict[GuildId, asyncio.Lock] = {}
 
     async def post_init(self) -> None:
         """Initialize the database table for guild configurations."""
@@ -194,18 +197,25 @@ class ConfigDB:
         if guild_id in self._cache:
             return self._cache[guild_id]
 
-        async with self.database.get_cursor() as cursor:
-            column_names = ", ".join(f.name for f in fields(GuildConfig))
-            await cursor.execute(
-                f"SELECT {column_names} FROM {self.TABLE_NAME} WHERE guild_id = ?",  # noqa: S608
-                (guild_id,),
-            )
-            row = await cursor.fetchone()
-
-        config = GuildConfig.from_row(row) if row else GuildConfig(guild_id=guild_id)
-
-        self._cache[guild_id] = config
-        return config
+        async with self._load_locks.setdefault(guild_id, asyncio.Lock()):
+            # Another caller may have loaded it while we waited for the lock
+            if guild_id in self._cache:
+                return self._cache[guild_id]
+
+            async with self.database.get_cursor() as cursor:
+                column_names = ", ".join(f.name for f in fields(GuildConfig))
+                await cursor.execute(
+                    f"SELECT {column_names} FROM {self.TABLE_NAME} WHERE guild_id = ?",  # noqa: S608
+                    (guild_id,),
+                )
+                row = await cursor.fetchone()
+
+            config = GuildConfig.from_row(row) if row else GuildConfig(guild_id=guild_id)
+
+            self._cache[guild_id] = config
+            # Callers already waiting hold the lock and find the cached config, so it can go
+            self._load_locks.pop(guild_id, None)
+            return config
 
     async def set_setting(self, guild_id: GuildId, setting: str, value: int | str | RoleIdList | None) -> None:
         """Update a single configuration value for a guild."""
@@ -8,13 +8,17 @@ special case where an inviter is unknown (represented by `inviter_id = 0`).
 
 import logging
 import os
+from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 import aiohttp
+import numpy as np
 
 from modules.dtypes import GuildId, InviterId, UserId
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from modules.Database import Database
 
 log = logging.getLogger(__name__)
@@ -26,6 +30,39 @@ API_HEADERS = {
     "User-Agent": "Kiwibot/InviteTracker (aiohttp, 1.0)",
 }
 
+# Length of the "YYYY-MM-DDTHH:MM:SS" prefix of a Discord ISO-8601 timestamp
+_ISO_SECONDS_LEN = 19
+
+
+def _to_joined_at(timestamp: str | None) -> str | None:
+    """Convert one ISO-8601 timestamp to the `joined_at` column format."""
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        log.warning("Could not parse joined_at timestamp: %s", timestamp)
+        return None  # Let the DB handle it
+
+
+def to_joined_at_batch(timestamps: Sequence[str | None]) -> list[str | None]:
+    """Convert ISO-8601 timestamps to the `joined_at` column format in one vectorized pass.
+
+    Like the per-value conversion, only the wall-clock part is kept and the UTC
+    offset is ignored. Falls back to converting each value if any fails to parse.
+    """
+    if not timestamps:
+        return []
+
+    raw = np.array([ts[:_ISO_SECONDS_LEN] if ts else "NaT" for ts in timestamps], dtype=f"U{_ISO_SECONDS_LEN}")
+    try:
+        parsed = raw.astype("datetime64[s]")
+    except ValueError:
+        return [_to_joined_at(ts) for ts in timestamps]
+
+    formatted = np.char.replace(np.datetime_as_string(parsed, unit="s"), "T", " ").tolist()
+    return [None if missing else text for text, missing in zip(formatted, np.isnat(parsed).tolist(), strict=True)]
+
 
 class InvitesDB:
     """Manages all database and API interactions for invite tracking."""
@@ -50,6 +87,12 @@ class InvitesDB:
                 ) STRICT, WITHOUT ROWID;
                 """,
             )
+            # Lets the per-guild leaderboard group by inviter without touching the table rows
+            await conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_invites_guild_inviter ON invites(guild_id, inviter_id);
+                """,
+            )
             await conn.commit()
             log.info("Initialized invites database table.")
 
@@ -150,7 +193,7 @@ class InvitesDB:
     async def get_invite_leaderboard(self, guild_id: GuildId) -> list[tuple[UserId, int]]:
         """Retrieve the top 10 inviters and their invite counts for a guild."""
         query = """
-            SELECT inviter_id, COUNT(invitee_id) as invite_count
+            SELECT inviter_id, COUNT(*) as invite_count
             FROM invites
             WHERE guild_id = ? AND inviter_id IS NOT NULL
             GROUP BY inviter_id
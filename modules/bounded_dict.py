@@ -0,0 +1,21 @@
+"""A size-capped dict for in-memory caches."""
+
+from collections import OrderedDict
+
+
+class BoundedDict[K, V](OrderedDict[K, V]):
+    """An OrderedDict that evicts its least recently set key once it holds more than `max_size` keys.
+
+    Setting a key moves it to the end, so the front always holds the next key to evict.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__()
+        self.max_size = max_size
+
+    def __setitem__(self, key: K, value: V) -> None:
+        """Set the key as the most recent one, evicting the oldest if over capacity."""
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.max_size:
+            self.popitem(last=False)
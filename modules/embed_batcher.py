@@ -0,0 +1,95 @@
+"""Per-channel batching of log embeds.
+
+Each channel gets one sender task. Embeds queued while a message is being sent
+are grouped into the next message, up to Discord's per-message limits, so a
+burst of log lines costs a handful of requests instead of one per line.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Final
+
+import discord
+
+from modules.dtypes import ChannelId
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+log = logging.getLogger(__name__)
+
+# Discord's limits on a single message
+MAX_EMBEDS_PER_MESSAGE: Final[int] = 10
+MAX_EMBED_CHARS_PER_MESSAGE: Final[int] = 6000
+# Default caps on pending embeds per channel and on messages in flight across all channels
+DEFAULT_QUEUE_MAX_SIZE: Final[int] = 500
+DEFAULT_SEND_CONCURRENCY: Final[int] = 16
+
+
+class EmbedBatcher:
+    """Queue embeds per channel and send them in as few messages as possible.
+
+    `send` performs the actual send and is expected to handle its own errors,
+    e.g. to raise a security alert when the bot can't post in the channel.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[discord.TextChannel, list[discord.Embed]], Awaitable[None]],
+        *,
+        queue_max_size: int = DEFAULT_QUEUE_MAX_SIZE,
+        send_concurrency: int = DEFAULT_SEND_CONCURRENCY,
+    ) -> None:
+        self._send = send
+        self._queue_max_size = queue_max_size
+        self._semaphore = asyncio.Semaphore(send_concurrency)
+        self._queues: dict[ChannelId, asyncio.Queue[discord.Embed]] = {}
+        self._senders: dict[ChannelId, asyncio.Task[None]] = {}
+
+    def queue(self, channel: discord.TextChannel, embed: discord.Embed) -> None:
+        """Queue an embed for the channel's sender, starting the sender on first use."""
+        queue = self._queues.get(ChannelId(channel.id))
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self._queue_max_size)
+            self._queues[ChannelId(channel.id)] = queue
+        sender = self._senders.get(ChannelId(channel.id))
+        # A sender that died on an unexpected error is replaced, so the rest of the queue still goes out
+        if sender is None or sender.done():
+            self._senders[ChannelId(channel.id)] = asyncio.create_task(self._drain(channel, queue))
+        try:
+            queue.put_nowait(embed)
+        except asyncio.QueueFull:
+            log.warning("Log backlog is full for channel %s in guild %s, dropping a log entry.", channel.id, channel.guild.id)
+
+    def forget(self, channel_id: ChannelId) -> None:
+        """Stop the channel's sender and drop anything still queued for it."""
+        self._queues.pop(channel_id, None)
+        sender = self._senders.pop(channel_id, None)
+        if sender:
+            sender.cancel()
+
+    def close(self) -> None:
+        """Stop all senders."""
+        for channel_id in list(self._senders):
+            self.forget(channel_id)
+
+    async def _drain(self, channel: discord.TextChannel, queue: asyncio.Queue[discord.Embed]) -> None:
+        """Send queued embeds, grouping everything that piled up during the previous send into one message."""
+        carried: discord.Embed | None = None
+        while True:
+            embeds = [carried or await queue.get()]
+            carried = None
+            total_length = len(embeds[0])
+            while len(embeds) < MAX_EMBEDS_PER_MESSAGE and not queue.empty():
+                embed = queue.get_nowait()
+                if total_length + len(embed) > MAX_EMBED_CHARS_PER_MESSAGE:
+                    carried = embed
+                    break
+                embeds.append(embed)
+                total_length += len(embed)
+
+            try:
+                async with self._semaphore:
+                    await self._send(channel, embeds)
+            except discord.HTTPException:
+                log.exception("Failed to send log embeds in guild %s", channel.guild.id)
@@ -1,3 +1,4 @@
+from functools import cache
 from typing import TYPE_CHECKING, ClassVar, Final, Self
 
 if TYPE_CHECKING:
@@ -14,6 +15,21 @@ type FullCommand = tuple[Command, AppCommand]
 type FullSubcommand = tuple[Command, AppCommandGroup]
 
 
+@cache
+def _pretty_print_perms(permissions: int) -> str:
+    """Return the readable names of the permission bits set in ``permissions``."""
+    if permissions & Permissions.administrator.flag:
+        return "administrator"
+
+    return ", ".join(
+        [
+            flag_name.replace("_", " ").title()
+            for flag_name, flag_val in Permissions.VALID_FLAGS.items()
+            if permissions & flag_val
+        ],
+    )
+
+
 # Data class used for fake interactions
 class FakeInteraction:
     permissions: Permissions
@@ -36,6 +52,9 @@ class FeijoaCommand:
     args: Final[dict[str, CommandParameter]]
     permissions: Final[int]
     command_id: Final[PositiveInt]
+    # Rendered once here so /help doesn't reformat the arguments on every call
+    rendered_args: Final[str]
+    rendered_usage: Final[str]
 
     def __init__(
         self,
@@ -50,6 +69,31 @@ class FeijoaCommand:
         self.args = params
         self.command_id = command_id
         self.permissions = permissions
+        self.rendered_args, self.rendered_usage = self._render_args(name, params or {})
+
+    @staticmethod
+    def _render_args(name: str, params: dict[str, CommandParameter]) -> tuple[str, str]:
+        arg_blocks: list[str] = []
+        args_usage: list[str] = []
+        for argument in params.values():
+            arg_blocks.append(
+                "\n".join(
+                    [
+                        f"Name: `{argument.name}`",
+                        f"Description: `{argument.description}`",
+                        f"Type: `{argument.type.name}`",
+                        f"Required: `{argument.required}`",
+                    ],
+                ),
+            )
+
+            if argument.required:
+                args_usage.append(f"<{argument.name}: {argument.type.name}>")
+            else:
+                args_usage.append(f"({argument.name}: {argument.type.name})")
+
+        args_str = "\n----------\n".join(arg_blocks)
+        return args_str, f"<> = required; () = optional\n```/{name} {' '.join(args_usage)}```"
 
     @staticmethod
     def _permission_walker(command: Command | Group) -> PositiveInt:
@@ -108,24 +152,15 @@ class FeijoaCommand:
             PositiveInt(command[1].parent.id),
         )
 
-    def get_pretty_printed_perms(self) -> str | None:
-        if self.permissions & Permissions.administrator.flag:
-            return "administrator"
-
-        # Fix: Check where bitwise AND is NOT zero (meaning permission is required)
-        return ", ".join(
-            [
-                flag_name.replace("_", " ").title()
-                for flag_name, flag_val in Permissions.VALID_FLAGS.items()
-                if self.permissions & flag_val == 0
-            ],
-        )
+    def get_pretty_printed_perms(self) -> str:
+        return _pretty_print_perms(self.permissions)
 
     def can_be_executed_by(self, user_perms: Permissions) -> bool:
-        if self.permissions == 0:
+        # Administrators bypass permission requirements, everyone else needs every required bit
+        if user_perms.administrator:
             return True
 
-        return bool(self.permissions & user_perms.value)
+        return user_perms.value & self.permissions == self.permissions
 
     def is_staff(self) -> bool:
         if not self.permissions:
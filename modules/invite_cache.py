@@ -0,0 +1,78 @@
+"""Column-oriented cache of invite use counts for a single guild.
+
+Codes and their use counts live in two parallel columns that share a position,
+with a small index mapping each code to its position. Removal swaps the last
+entry into the freed slot so the columns stay dense.
+"""
+
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+@dataclass(slots=True)
+class GuildInviteCache:
+    """Invite code to use count mapping for one guild."""
+
+    codes: list[str] = field(default_factory=list)
+    uses: array[int] = field(default_factory=lambda: array("I"))
+    index: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[str, int]]) -> Self:
+        """Build a cache from ``(code, uses)`` pairs."""
+        cache = cls()
+        for code, uses in pairs:
+            cache.set(code, uses)
+        return cache
+
+    def __len__(self) -> int:
+        """Return the number of cached invites."""
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        """Return whether ``code`` is cached."""
+        return code in self.index
+
+    def get(self, code: str) -> int:
+        """Return the cached uses for ``code``, or 0 if it is not cached."""
+        position = self.index.get(code)
+        return 0 if position is None else self.uses[position]
+
+    def set(self, code: str, uses: int) -> None:
+        """Insert or overwrite the cached uses for ``code``."""
+        position = self.index.get(code)
+        if position is None:
+            self.index[code] = len(self.codes)
+            self.codes.append(code)
+            self.uses.append(uses)
+        else:
+            self.uses[position] = uses
+
+    def discard(self, code: str) -> None:
+        """Remove ``code`` from the cache if present."""
+        position = self.index.pop(code, None)
+        if position is None:
+            return
+
+        last_code = self.codes.pop()
+        last_uses = self.uses.pop()
+        if position < len(self.codes):
+            self.codes[position] = last_code
+            self.uses[position] = last_uses
+            self.index[last_code] = position
+
+    def sync(self, pairs: Iterable[tuple[str, int]]) -> None:
+        """Update the cache in place to match ``pairs``, dropping codes that are absent."""
+        seen: set[str] = set()
+        for code, uses in pairs:
+            seen.add(code)
+            position = self.index.get(code)
+            if position is None or self.uses[position] != uses:
+                self.set(code, uses)
+
+        for stale in self.index.keys() - seen:
+            self.discard(stale)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Final, NewType
 
 import discord
@@ -115,13 +116,25 @@ def check_verifiable_role(role: discord.Role) -> ValidationResult:
     if role.is_default():
         return ValidationResult(False, "The @everyone role cannot be used for this feature.")
 
+    return _check_verifiable_permissions(role.mention, role.permissions.value)
+
+
+@lru_cache(maxsize=1024)
+def _check_verifiable_permissions(role_mention: str, permissions_value: int) -> ValidationResult:
+    """Check a role's permission bits against the verified-role allow-list.
+
+    Cached on the role and its permission bits, so editing the role's
+    permissions produces a new key rather than a stale result.
+    """
+    permissions = Permissions(permissions_value)
+
     # 2. Check if all permissions are within the allowed set
-    # (role.permissions | VERIFIED_ROLE_PERMISSIONS) is the union of perms
+    # (permissions | VERIFIED_ROLE_PERMISSIONS) is the union of perms
     # If this union is *different* from the allowed perms, it means
     # the role has permissions that are *not* in the allowed list.
-    if (role.permissions | VERIFIED_ROLE_PERMISSIONS) != VERIFIED_ROLE_PERMISSIONS:
+    if (permissions | VERIFIED_ROLE_PERMISSIONS) != VERIFIED_ROLE_PERMISSIONS:
         # Find the extra permissions
-        disallowed_perms = role.permissions & ~VERIFIED_ROLE_PERMISSIONS
+        disallowed_perms = permissions & ~VERIFIED_ROLE_PERMISSIONS
 
         # Get the names of the disallowed perms
         found_perms = [name for name, has in disallowed_perms if has]
@@ -132,14 +145,14 @@ def check_verifiable_role(role: discord.Role) -> ValidationResult:
             # We report the raw value so the developer can investigate.
             return ValidationResult(
                 False,
-                f"Role {role.mention} has unknown disallowed permissions "
+                f"Role {role_mention} has unknown disallowed permissions "
                 f"(raw bitfield value: {disallowed_perms.value}). "
                 "This usually indicates a new Discord permission not yet supported by your library version.",
             )
 
         return ValidationResult(
             False,
-            f"Role {role.mention} has permissions that are not allowed for a verified role: {', '.join(found_perms)}",
+            f"Role {role_mention} has permissions that are not allowed for a verified role: {', '.join(found_perms)}",
         )
 
     return ValidationResult(True)